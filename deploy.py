@@ -2,53 +2,177 @@
 Deployment script for GDPR Compliance Framework
 Deploys to Databricks using Databricks CLI or SDK
 """
+import dataclasses
+import hashlib
 import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
+from typing import Callable, List, Optional, Tuple, TypeVar
+import orjson
 from databricks.sdk import WorkspaceClient
-from databricks.sdk.service.jobs import JobSettings, Task, JobTaskSettings
+from databricks.sdk.errors import TemporarilyUnavailable, TooManyRequests
+from databricks.sdk.service.jobs import JobSettings
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 
 
-def deploy_jobs():
+T = TypeVar("T")
+
+# Transient API errors that are safe to retry
+_RETRYABLE_ERRORS = (TooManyRequests, TemporarilyUnavailable)
+
+
+def _call_with_retry(
+    func: Callable[..., T],
+    *args,
+    max_attempts: int = 5,
+    base_delay: float = 0.5,
+    max_delay: float = 30.0,
+    **kwargs
+) -> T:
+    """Call a Databricks API function, retrying transient errors with exponential backoff"""
+    for attempt in range(max_attempts):
+        try:
+            return func(*args, **kwargs)
+        except _RETRYABLE_ERRORS:
+            if attempt == max_attempts - 1:
+                raise
+            time.sleep(min(base_delay * 2 ** attempt, max_delay))
+
+
+class _TaskSpec(BaseModel):
+    """Minimal schema for a job task in databricks_jobs.yaml"""
+    model_config = ConfigDict(extra="allow")
+    
+    task_key: str
+
+
+class _JobSpec(BaseModel):
+    """Minimal schema for a job in databricks_jobs.yaml"""
+    model_config = ConfigDict(extra="allow")
+    
+    name: str
+    tasks: List[_TaskSpec] = []
+
+
+_JOB_SPECS = TypeAdapter(List[_JobSpec])
+
+# Job tag holding the hash of the deployed configuration
+CONFIG_HASH_TAG = "config_hash"
+
+
+def _config_hash(job_config: dict) -> str:
+    """Stable content hash of a job configuration"""
+    payload = orjson.dumps(job_config, option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def _build_settings(spec: _JobSpec) -> Tuple[JobSettings, str]:
+    """Build JobSettings for a spec, tagged with its configuration hash"""
+    job_config = spec.model_dump(exclude_none=True, mode="json")
+    config_hash = _config_hash(job_config)
+    job_config["tags"] = {**job_config.get("tags", {}), CONFIG_HASH_TAG: config_hash}
+    return JobSettings.from_dict(job_config), config_hash
+
+
+@lru_cache(maxsize=4)
+def _get_client(profile: Optional[str] = None) -> WorkspaceClient:
+    """Return a cached WorkspaceClient so auth and the HTTP session are set up once"""
+    return WorkspaceClient(profile=profile)
+
+
+def _load_jobs_config(path: str) -> dict:
+    """Parse the jobs YAML, using the libyaml C loader when available"""
+    import yaml
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(path, "r") as f:
+        return yaml.load(f, Loader=loader) or {}
+
+
+def _deploy_job(
+    w: WorkspaceClient,
+    settings: JobSettings,
+    config_hash: str,
+    existing: Optional[Tuple[int, Optional[str]]]
+) -> str:
+    """Create or update a single job, returning a status line"""
+    job_name = settings.name
+    try:
+        if existing is not None:
+            job_id, deployed_hash = existing
+            if deployed_hash == config_hash:
+                return f"  {job_name}: unchanged, skipping (ID: {job_id})"
+            _call_with_retry(w.jobs.update, job_id=job_id, new_settings=settings)
+            return f"  {job_name}: updated existing job (ID: {job_id})"
+        create_kwargs = {
+            field.name: getattr(settings, field.name)
+            for field in dataclasses.fields(settings)
+            if getattr(settings, field.name) is not None
+        }
+        job = _call_with_retry(w.jobs.create, **create_kwargs)
+        return f"  {job_name}: created job with ID: {job.job_id}"
+    except Exception as e:
+        return f"  {job_name}: ✗ Error: {str(e)}"
+
+
+def deploy_jobs(max_workers: int = 8):
     """Deploy Databricks jobs"""
     print("Deploying GDPR Compliance Jobs to Databricks...")
     
-    # Initialize Databricks client
-    w = WorkspaceClient()
+    # Initialize Databricks client (shared by all workers, so the HTTP
+    # session is reused across calls)
+    w = _get_client()
     
     # Read jobs configuration
-    import yaml
-    with open("databricks_jobs.yaml", "r") as f:
-        jobs_config = yaml.safe_load(f)
+    jobs_config = _load_jobs_config("databricks_jobs.yaml")
     
-    for job_config in jobs_config.get("jobs", []):
-        job_name = job_config["name"]
-        print(f"\nCreating/updating job: {job_name}")
-        
-        try:
-            # Check if job exists
-            existing_jobs = w.jobs.list(name=job_name)
-            if existing_jobs:
-                job_id = existing_jobs[0].job_id
-                print(f"  Updating existing job (ID: {job_id})")
-                w.jobs.update(
-                    job_id=job_id,
-                    new_settings=JobSettings(**job_config)
-                )
-            else:
-                print(f"  Creating new job")
-                job = w.jobs.create(name=job_name, settings=JobSettings(**job_config))
-                print(f"  Created job with ID: {job.job_id}")
-        
-        except Exception as e:
-            print(f"  ✗ Error: {str(e)}")
+    # Validate every job definition before making any API calls
+    job_specs = _JOB_SPECS.validate_python(jobs_config.get("jobs", []))
+    if not job_specs:
+        print("  No jobs defined, skipping...")
+        return
+    
+    job_settings = [_build_settings(spec) for spec in job_specs]
+    
+    # List existing jobs once instead of issuing a filtered list per job,
+    # keeping the deployed config hash so unchanged jobs can be skipped
+    existing_jobs = {
+        job.settings.name: (job.job_id, (job.settings.tags or {}).get(CONFIG_HASH_TAG))
+        for job in w.jobs.list()
+        if job.settings is not None
+    }
+    
+    print(f"\nCreating/updating {len(job_settings)} job(s)...")
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(job_settings))) as executor:
+        futures = [
+            executor.submit(
+                _deploy_job, w, settings, config_hash, existing_jobs.get(settings.name)
+            )
+            for settings, config_hash in job_settings
+        ]
+        for future in as_completed(futures):
+            print(future.result())
 
 
-def upload_notebooks():
+def _upload_notebook(w: WorkspaceClient, notebook_file: Path, workspace_notebook_path: str):
+    """Upload a single notebook file to the workspace"""
+    # Pass the open file so the SDK streams it rather than holding a full copy
+    with open(notebook_file, "rb") as f:
+        w.workspace.upload(
+            workspace_notebook_path,
+            content=f,
+            format="PYTHON",
+            overwrite=True
+        )
+
+
+def upload_notebooks(max_workers: int = 6):
     """Upload Python notebooks to Databricks workspace"""
     print("\nUploading notebooks to Databricks workspace...")
     
-    w = WorkspaceClient()
+    w = _get_client()
     
     notebooks_dir = Path("notebooks")
     if not notebooks_dir.exists():
@@ -64,18 +188,27 @@ def upload_notebooks():
     except Exception:
         pass  # Directory might already exist
     
-    # Upload notebook files
-    for notebook_file in notebooks_dir.glob("*.py"):
-        workspace_notebook_path = f"{workspace_path}/{notebook_file.stem}"
-        print(f"  Uploading {notebook_file.name} -> {workspace_notebook_path}")
+    # scandir reuses the directory entry's cached type info instead of a stat per file
+    with os.scandir(notebooks_dir) as entries:
+        notebook_files = sorted(
+            Path(entry.path)
+            for entry in entries
+            if entry.name.endswith(".py") and entry.is_file()
+        )
+    if not notebook_files:
+        return
+    
+    # Upload notebook files concurrently over the shared client session
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(notebook_files))) as executor:
+        futures = {}
+        for notebook_file in notebook_files:
+            workspace_notebook_path = f"{workspace_path}/{notebook_file.stem}"
+            print(f"  Uploading {notebook_file.name} -> {workspace_notebook_path}")
+            future = executor.submit(_upload_notebook, w, notebook_file, workspace_notebook_path)
+            futures[future] = notebook_file
         
-        with open(notebook_file, "rb") as f:
-            w.workspace.upload(
-                workspace_notebook_path,
-                content=f.read(),
-                format="PYTHON",
-                overwrite=True
-            )
+        for future in as_completed(futures):
+            future.result()
 
 
 def main():
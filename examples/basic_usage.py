@@ -2,14 +2,8 @@
 Example: Basic Usage of GDPR Compliance Framework
 Demonstrates common compliance operations
 """
-import sys
-from pathlib import Path
-
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from src.config import load_config
-from src.governance import GDPRGovernanceFramework
+from gdpr_compliance.config import load_config
+from gdpr_compliance.governance import GDPRGovernanceFramework
 from pyspark.sql import SparkSession
 
 
@@ -109,9 +103,7 @@ def example_3_retention_policy():
     print("\nApplying retention policies...")
     results = framework.apply_retention_policies()
     
-    for table, result in results.items():
-        status = result.get("status")
-        rows_deleted = result.get("rows_deleted", 0)
+    for table, status, rows_deleted in zip(results.tables, results.statuses, results.rows_deleted):
         print(f"  {table}: {status}, {rows_deleted} rows deleted")
 
 
@@ -0,0 +1,9 @@
+"""
+Python Version Compatibility Helpers
+"""
+import sys
+
+
+# Keyword arguments enabling __slots__ on dataclasses where supported (3.10+);
+# on older interpreters the dataclass keeps its instance __dict__
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
@@ -0,0 +1,754 @@
+"""
+Complete Audit Trail System
+Records all data access and modifications for compliance
+"""
+from datetime import datetime, timezone
+from typing import Dict, Optional, Any, Iterator, List
+from dataclasses import dataclass
+from enum import Enum
+from functools import lru_cache
+import json
+import queue
+import threading
+import time
+import uuid
+import warnings
+
+from ._compat import DATACLASS_SLOTS
+
+
+class AuditEventType(Enum):
+    """Types of audit events"""
+    DATA_ACCESS = "data_access"
+    DATA_MODIFICATION = "data_modification"
+    DATA_DELETION = "data_deletion"
+    SCHEMA_CHANGE = "schema_change"
+    PII_DETECTED = "pii_detected"
+    PSEUDONYMIZATION = "pseudonymization"
+    ANONYMIZATION = "anonymization"
+    RETENTION_APPLIED = "retention_applied"
+    QUALITY_CHECK = "quality_check"
+    EXPORT = "export"
+    USER_ACTION = "user_action"
+
+
+@dataclass(**DATACLASS_SLOTS)
+class AuditLog:
+    """Represents an audit log entry"""
+    event_type: AuditEventType
+    table_name: str
+    user: str
+    timestamp_ns: int  # Nanoseconds since the epoch (time.time_ns())
+    details: Dict[str, Any]
+    ip_address: Optional[str] = None
+    user_agent: Optional[str] = None
+    job_id: Optional[str] = None
+    notebook_path: Optional[str] = None
+    audit_id: Optional[str] = None
+    
+    @property
+    def timestamp(self) -> datetime:
+        """Event time as a UTC datetime (built on demand)"""
+        return datetime.fromtimestamp(self.timestamp_ns / 1e9, tz=timezone.utc)
+    
+    def to_tuple(self) -> tuple:
+        """Convert to a row tuple in AUDIT_COLUMNS order for storage"""
+        return (
+            self.audit_id,
+            self.event_type.value,
+            self.table_name,
+            self.user,
+            self.timestamp,
+            json.dumps(self.details, default=str),
+            self.ip_address,
+            self.user_agent,
+            self.job_id,
+            self.notebook_path
+        )
+
+
+class _FlushRequest:
+    """Marker queued by flush(); the writer signals it once prior entries are written"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.error: Optional[BaseException] = None
+
+
+# Queued by close() to stop the background writer
+_STOP = object()
+
+
+# Column order of the audit table; AuditLog.to_tuple() follows it
+AUDIT_COLUMNS = [
+    ("audit_id", "string"),
+    ("event_type", "string"),
+    ("table_name", "string"),
+    ("user", "string"),
+    ("timestamp", "timestamp"),
+    ("details", "string"),
+    ("ip_address", "string"),
+    ("user_agent", "string"),
+    ("job_id", "string"),
+    ("notebook_path", "string"),
+]
+
+
+@lru_cache(maxsize=1)
+def get_audit_schema():
+    """Build the Spark schema of the audit table (matches AUDIT_COLUMNS)"""
+    from pyspark.sql.types import StringType, StructField, StructType, TimestampType
+    
+    spark_types = {"string": StringType(), "timestamp": TimestampType()}
+    return StructType([
+        StructField(name, spark_types[col_type], True)
+        for name, col_type in AUDIT_COLUMNS
+    ])
+
+
+class AuditLogger:
+    """Comprehensive audit logging system"""
+    
+    def __init__(
+        self,
+        catalog: str,
+        schema: str,
+        table_name: str = "audit_logs",
+        spark_session=None,
+        max_buffer_size: int = 1000,
+        max_buffer_age_seconds: float = 5.0,
+        max_queue_size: int = 10000,
+        max_enqueue_wait_seconds: float = 1.0
+    ):
+        """
+        Initialize audit logger
+        
+        Entries are queued by log() and written by a background thread in
+        batches of up to max_buffer_size, or once the oldest queued entry is
+        max_buffer_age_seconds old. When the queue is full, log() waits up to
+        max_enqueue_wait_seconds for room and then writes the entry itself
+        (counted in overflow_sync_writes), so no entry is ever dropped.
+        
+        Args:
+            catalog: Databricks catalog name
+            schema: Schema name
+            table_name: Name of audit log table
+            spark_session: Spark session (optional)
+            max_buffer_size: Maximum number of entries written per batch
+            max_buffer_age_seconds: Maximum time an entry waits before being written
+            max_queue_size: Maximum number of entries waiting to be written
+            max_enqueue_wait_seconds: How long log() waits for room in a full
+                queue before writing synchronously
+        """
+        self.catalog = catalog
+        self.schema = schema
+        self.table_name = table_name
+        self.full_table_name = f"{catalog}.{schema}.{table_name}"
+        self.spark = spark_session
+        self.max_buffer_size = max_buffer_size
+        self.max_buffer_age_seconds = max_buffer_age_seconds
+        self.max_enqueue_wait_seconds = max_enqueue_wait_seconds
+        self.overflow_sync_writes = 0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue_size)
+        # Entries from failed writes, retried ahead of newer ones
+        self._pending: List[AuditLog] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self._table_initialized = False
+        self._worker = threading.Thread(
+            target=self._run_writer,
+            name=f"audit-writer-{table_name}",
+            daemon=True
+        )
+        self._worker.start()
+    
+    @property
+    def log_buffer(self) -> List[AuditLog]:
+        """Snapshot of entries not yet written to the audit table"""
+        with self._queue.mutex:
+            queued = [item for item in self._queue.queue if isinstance(item, AuditLog)]
+        with self._lock:
+            return self._pending + queued
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _initialize_table(self, skip_if_exists: bool = True):
+        """
+        Initialize the audit log table if it doesn't exist
+        
+        Args:
+            skip_if_exists: If True, check the catalog first and skip the
+                CREATE statement (and its metastore lock) for existing tables
+        """
+        if self.spark is None:
+            from pyspark.sql import SparkSession
+            self.spark = SparkSession.getActiveSession()
+        
+        if self.spark is None:
+            raise ValueError("Spark session required for table initialization")
+        
+        if skip_if_exists and self.spark.catalog.tableExists(self.full_table_name):
+            self._table_initialized = True
+            return
+        
+        create_table_sql = f"""
+        CREATE TABLE IF NOT EXISTS {self.full_table_name} (
+            audit_id STRING,
+            event_type STRING,
+            table_name STRING,
+            user STRING,
+            timestamp TIMESTAMP,
+            details STRING,
+            ip_address STRING,
+            user_agent STRING,
+            job_id STRING,
+            notebook_path STRING,
+            event_date DATE GENERATED ALWAYS AS (CAST(timestamp AS DATE))
+        ) USING DELTA
+        PARTITIONED BY (event_type, event_date)
+        TBLPROPERTIES (
+            'delta.autoOptimize.optimizeWrite' = 'true',
+            'delta.autoOptimize.autoCompact' = 'true'
+        )
+        """
+        
+        self.spark.sql(create_table_sql)
+        self._table_initialized = True
+    
+    def log(
+        self,
+        event_type: AuditEventType,
+        table_name: str,
+        user: str,
+        details: Dict[str, Any],
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None,
+        job_id: Optional[str] = None,
+        notebook_path: Optional[str] = None
+    ):
+        """
+        Log an audit event
+        
+        Args:
+            event_type: Type of event
+            table_name: Table affected
+            user: User who performed the action
+            details: Additional event details
+            ip_address: IP address of user
+            user_agent: User agent string
+            job_id: Optional job ID
+            notebook_path: Optional notebook path
+        """
+        audit_log = self._build_entry(
+            event_type=event_type,
+            table_name=table_name,
+            user=user,
+            details=details,
+            ip_address=ip_address,
+            user_agent=user_agent,
+            job_id=job_id,
+            notebook_path=notebook_path
+        )
+        
+        self._append([audit_log])
+    
+    def log_bulk(self, events: List[Dict[str, Any]]):
+        """
+        Log several audit events at once
+        
+        All events are buffered together and written by the next flush as a
+        single append.
+        
+        Args:
+            events: List of keyword-argument dicts accepted by log()
+        """
+        entries = [self._build_entry(**event) for event in events]
+        self._append(entries)
+    
+    def _append(self, entries: List[AuditLog]):
+        """
+        Queue entries for the background writer
+        
+        A full queue applies backpressure: the caller waits for room and,
+        if the writer still lags, writes the entry synchronously. A failed
+        synchronous write keeps the entry pending for the next batch.
+        """
+        for entry in entries:
+            try:
+                self._queue.put(entry, timeout=self.max_enqueue_wait_seconds)
+                continue
+            except queue.Full:
+                pass
+            
+            with self._lock:
+                self.overflow_sync_writes += 1
+            try:
+                self._write_batch([entry])
+            except Exception as e:
+                warnings.warn(
+                    f"Audit queue full and synchronous write to {self.full_table_name} "
+                    f"failed; entry kept for retry: {e}",
+                    RuntimeWarning
+                )
+    
+    def _run_writer(self):
+        """Background loop writing queued entries in batches"""
+        while True:
+            batch: List[AuditLog] = []
+            deadline = None
+            control = None
+            
+            while len(batch) < self.max_buffer_size:
+                timeout = None if deadline is None else deadline - time.monotonic()
+                if timeout is not None and timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if not isinstance(item, AuditLog):
+                    control = item
+                    break
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.max_buffer_age_seconds
+            
+            error = None
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                # Entries stay pending and are retried with the next batch
+                error = e
+            
+            if isinstance(control, _FlushRequest):
+                control.error = error
+                control.done.set()
+            elif control is _STOP:
+                return
+    
+    def _resolve_spark(self):
+        """Resolve the Spark session, raising if none is available"""
+        if self.spark is None:
+            from pyspark.sql import SparkSession
+            self.spark = SparkSession.getActiveSession()
+        
+        if self.spark is None:
+            raise ValueError("Spark session required to flush audit logs")
+        return self.spark
+    
+    def _build_entry(
+        self,
+        event_type: AuditEventType,
+        table_name: str,
+        user: str,
+        details: Dict[str, Any],
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None,
+        job_id: Optional[str] = None,
+        notebook_path: Optional[str] = None
+    ) -> AuditLog:
+        """Create an audit log entry with a fresh ID and timestamp"""
+        return AuditLog(
+            audit_id=uuid.uuid4().hex,
+            event_type=event_type,
+            table_name=table_name,
+            user=user,
+            timestamp_ns=time.time_ns(),
+            details=details,
+            ip_address=ip_address,
+            user_agent=user_agent,
+            job_id=job_id,
+            notebook_path=notebook_path
+        )
+    
+    def log_data_access(
+        self,
+        table_name: str,
+        user: str,
+        columns_accessed: List[str],
+        row_count: Optional[int] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ):
+        """Log data access event"""
+        self.log(
+            event_type=AuditEventType.DATA_ACCESS,
+            table_name=table_name,
+            user=user,
+            details={
+                "columns_accessed": columns_accessed,
+                "row_count": row_count,
+                "filters": filters or {}
+            },
+            **kwargs
+        )
+    
+    def log_pii_detection(
+        self,
+        table_name: str,
+        user: str,
+        pii_types: List[str],
+        columns: List[str],
+        **kwargs
+    ):
+        """Log PII detection event"""
+        self.log(
+            event_type=AuditEventType.PII_DETECTED,
+            table_name=table_name,
+            user=user,
+            details={
+                "pii_types": pii_types,
+                "columns": columns
+            },
+            **kwargs
+        )
+    
+    def log_pseudonymization(
+        self,
+        table_name: str,
+        user: str,
+        columns_pseudonymized: List[str],
+        row_count: int,
+        **kwargs
+    ):
+        """Log pseudonymization event"""
+        self.log(
+            event_type=AuditEventType.PSEUDONYMIZATION,
+            table_name=table_name,
+            user=user,
+            details={
+                "columns_pseudonymized": columns_pseudonymized,
+                "row_count": row_count
+            },
+            **kwargs
+        )
+    
+    def log_data_deletion(
+        self,
+        table_name: str,
+        user: str,
+        row_count: int,
+        reason: str,
+        **kwargs
+    ):
+        """Log data deletion event"""
+        self.log(
+            event_type=AuditEventType.DATA_DELETION,
+            table_name=table_name,
+            user=user,
+            details={
+                "row_count": row_count,
+                "reason": reason
+            },
+            **kwargs
+        )
+    
+    def log_retention_applied(
+        self,
+        table_name: str,
+        rows_deleted: int,
+        retention_years: int,
+        cutoff_date: Optional[str] = None,
+        exact_cutoff_date: Optional[str] = None,
+        **kwargs
+    ):
+        """Log retention policy application"""
+        details = {
+            "rows_deleted": rows_deleted,
+            "retention_years": retention_years
+        }
+        if cutoff_date is not None:
+            # Cutoff used for deletion and the unaligned one it was rounded from
+            details["cutoff_date"] = cutoff_date
+            details["exact_cutoff_date"] = exact_cutoff_date
+        self.log(
+            event_type=AuditEventType.RETENTION_APPLIED,
+            table_name=table_name,
+            user="system",
+            details=details,
+            **kwargs
+        )
+    
+    def flush(self):
+        """
+        Write all entries logged so far to the audit table
+        
+        Blocks until the background writer has written every entry queued
+        before this call and re-raises its error if the write failed.
+        """
+        if not self.log_buffer and not self._worker.is_alive():
+            return
+        
+        # Resolve the session here: the active session is thread-local
+        if self.log_buffer:
+            self._resolve_spark()
+        
+        if not self._worker.is_alive():
+            self._write_batch(self._drain_queue())
+            return
+        
+        request = _FlushRequest()
+        self._queue.put(request)
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+    
+    def close(self):
+        """Stop the background writer and write any remaining entries"""
+        if self._closed:
+            return
+        self._closed = True
+        
+        self._queue.put(_STOP)
+        self._worker.join()
+        
+        # Entries logged after the stop marker or left by a failed write
+        if self.log_buffer:
+            self._resolve_spark()
+            self._write_batch(self._drain_queue())
+    
+    def _drain_queue(self) -> List[AuditLog]:
+        """Take every entry currently queued"""
+        entries = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return entries
+            if isinstance(item, AuditLog):
+                entries.append(item)
+    
+    def _write_batch(self, batch: List[AuditLog]):
+        """Append pending entries plus a new batch to the audit table"""
+        with self._lock:
+            log_entries, self._pending = self._pending + batch, []
+        
+        if not log_entries:
+            return
+        
+        try:
+            self._resolve_spark()
+            
+            # Initialize table once per logger; CREATE IF NOT EXISTS still
+            # guards against other processes creating it concurrently
+            if not self._table_initialized:
+                try:
+                    self._initialize_table()
+                except Exception:
+                    pass  # Table might already exist
+            
+            # Build typed rows directly; the fixed schema skips inference
+            rows = [log_entry.to_tuple() for log_entry in log_entries]
+            spark_df = self.spark.createDataFrame(rows, schema=get_audit_schema())
+            
+            # Write to Delta table
+            spark_df.write \
+                .format("delta") \
+                .mode("append") \
+                .saveAsTable(self.full_table_name)
+        except Exception:
+            # Keep the batch so a later write can retry it
+            with self._lock:
+                self._pending[:0] = log_entries
+            raise
+    
+    def _filter_audit_trail(
+        self,
+        table_name: Optional[str] = None,
+        user: Optional[str] = None,
+        event_type: Optional[AuditEventType] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ):
+        """Build the filtered audit table DataFrame (None without a Spark session)"""
+        if self.spark is None:
+            from pyspark.sql import SparkSession
+            self.spark = SparkSession.getActiveSession()
+        
+        if self.spark is None:
+            return None
+        
+        from pyspark.sql import functions as F
+        
+        df = self.spark.table(self.full_table_name)
+        
+        # Column predicates (not interpolated SQL) keep the plan stable;
+        # event_type (and event_date, where present) are the partition columns
+        if table_name:
+            df = df.filter(F.col("table_name") == table_name)
+        if user:
+            df = df.filter(F.col("user") == user)
+        if event_type:
+            df = df.filter(F.col("event_type") == F.lit(event_type.value))
+        # Date bounds always filter on timestamp for the exact cut; tables
+        # created with the event_date partition column also get the bound on
+        # it so partitions are pruned (older tables have no event_date)
+        has_event_date = "event_date" in df.columns
+        if start_date:
+            start = F.lit(start_date)
+            df = df.filter(F.col("timestamp") >= start)
+            if has_event_date:
+                df = df.filter(F.col("event_date") >= F.to_date(start))
+        if end_date:
+            end = F.lit(end_date)
+            df = df.filter(F.col("timestamp") <= end)
+            if has_event_date:
+                df = df.filter(F.col("event_date") <= F.to_date(end))
+        return df
+    
+    def _sorted_audit_trail(
+        self,
+        table_name: Optional[str] = None,
+        user: Optional[str] = None,
+        event_type: Optional[AuditEventType] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: Optional[int] = None
+    ):
+        """Filtered audit table DataFrame, newest first (None without a Spark session)"""
+        df = self._filter_audit_trail(table_name, user, event_type, start_date, end_date)
+        if df is None:
+            return None
+        
+        df = df.orderBy(df["timestamp"].desc())
+        if limit is not None:
+            # Sort + limit plans as a top-K instead of a full sort
+            df = df.limit(limit)
+        return df
+    
+    def get_audit_trail(
+        self,
+        table_name: Optional[str] = None,
+        user: Optional[str] = None,
+        event_type: Optional[AuditEventType] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: Optional[int] = None
+    ) -> List:
+        """
+        Retrieve audit trail with filters
+        
+        Args:
+            table_name: Filter by table name
+            user: Filter by user
+            event_type: Filter by event type
+            start_date: Start date for filtering
+            end_date: End date for filtering
+            limit: Maximum number of entries to return
+        
+        Returns:
+            List of audit log rows, newest first (empty if the query fails)
+        """
+        try:
+            df = self._sorted_audit_trail(table_name, user, event_type, start_date, end_date, limit)
+            if df is None:
+                return []
+            return df.collect()
+        except Exception:
+            return []
+    
+    def iter_audit_trail(
+        self,
+        table_name: Optional[str] = None,
+        user: Optional[str] = None,
+        event_type: Optional[AuditEventType] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: Optional[int] = None
+    ) -> Iterator:
+        """
+        Stream the audit trail with filters
+        
+        Rows are fetched to the driver one partition at a time, newest first,
+        so large trails need not fit in driver memory.
+        
+        Args:
+            table_name: Filter by table name
+            user: Filter by user
+            event_type: Filter by event type
+            start_date: Start date for filtering
+            end_date: End date for filtering
+            limit: Maximum number of entries to return
+        
+        Returns:
+            Iterator over audit log rows
+        
+        Raises:
+            ValueError: If no Spark session is available; query errors are
+                raised as well, possibly while iterating
+        """
+        df = self._sorted_audit_trail(table_name, user, event_type, start_date, end_date, limit)
+        if df is None:
+            raise ValueError("Spark session required to query audit logs")
+        return df.toLocalIterator(prefetchPartitions=True)
+    
+    def count_audit_events(
+        self,
+        table_name: Optional[str] = None,
+        user: Optional[str] = None,
+        event_type: Optional[AuditEventType] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> int:
+        """
+        Count audit entries matching the filters without fetching them
+        
+        Args:
+            table_name: Filter by table name
+            user: Filter by user
+            event_type: Filter by event type
+            start_date: Start date for filtering
+            end_date: End date for filtering
+        
+        Returns:
+            Number of matching audit entries
+        """
+        df = self._filter_audit_trail(table_name, user, event_type, start_date, end_date)
+        if df is None:
+            raise ValueError("Spark session required to query audit logs")
+        return df.count()
+    
+    def count_audit_events_by_table(
+        self,
+        table_names: List[str],
+        user: Optional[str] = None,
+        event_type: Optional[AuditEventType] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Dict[str, int]:
+        """
+        Count audit entries for several tables with one grouped query
+        
+        Args:
+            table_names: Tables to count events for
+            user: Filter by user
+            event_type: Filter by event type
+            start_date: Start date for filtering
+            end_date: End date for filtering
+        
+        Returns:
+            Dictionary mapping table names to their number of matching entries
+        """
+        counts = {table_name: 0 for table_name in table_names}
+        if not table_names:
+            return counts
+        
+        df = self._filter_audit_trail(None, user, event_type, start_date, end_date)
+        if df is None:
+            raise ValueError("Spark session required to query audit logs")
+        
+        from pyspark.sql import functions as F
+        
+        rows = (
+            df.filter(F.col("table_name").isin(table_names))
+            .groupBy("table_name")
+            .count()
+            .collect()
+        )
+        for row in rows:
+            counts[row["table_name"]] = row["count"]
+        return counts
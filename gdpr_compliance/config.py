@@ -2,6 +2,7 @@
 Configuration management for GDPR compliance framework
 """
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 try:
@@ -30,6 +31,7 @@ class GDPRConfig(BaseSettings):
     
     # Retention Policy
     retention_years: int = Field(7, env="RETENTION_YEARS")
+    retention_max_workers: int = Field(8, env="RETENTION_MAX_WORKERS")
     
     # Audit Configuration
     audit_log_table: str = Field(
@@ -58,6 +60,7 @@ class GDPRConfig(BaseSettings):
         extra = "ignore"
 
 
+@lru_cache(maxsize=1)
 def load_config() -> GDPRConfig:
     """Load configuration from environment variables"""
     # Try to find .env file in project root
@@ -0,0 +1,490 @@
+"""
+Data Quality Validation Framework
+Validates data quality before processing to reject bad data early
+"""
+from typing import Dict, List, Optional, Any, Callable
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+from functools import cached_property
+import operator
+import re
+import numpy as np
+import pandas as pd
+
+from ._compat import DATACLASS_SLOTS
+
+try:
+    import numba
+except ImportError:
+    # Optional JIT for the range check on large columns
+    numba = None
+
+
+# Columns at least this long use the single-pass numba range kernel
+NUMBA_MIN_ROWS = 100_000
+
+if numba is not None:
+    @numba.njit(cache=True, parallel=True)
+    def _count_out_of_bounds(values, low, high):
+        """Count values below low and above high in one parallel pass"""
+        below = 0
+        above = 0
+        for i in numba.prange(values.size):
+            value = values[i]
+            if value < low:
+                below += 1
+            elif value > high:
+                above += 1
+        return below, above
+
+
+class ValidationSeverity(Enum):
+    """Severity levels for validation failures"""
+    ERROR = "error"  # Reject data
+    WARNING = "warning"  # Flag but allow
+    INFO = "info"  # Informational only
+
+
+@dataclass
+class ValidationRule:
+    """A data quality validation rule"""
+    name: str
+    description: str
+    severity: ValidationSeverity
+    check_function: Callable
+    column: Optional[str] = None  # None for table-level checks
+    uses_column_stats: bool = False  # Check receives ColumnStats, not the Series
+    _bound_check: Callable = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self._bound_check = _bind_rule(self)
+
+
+@dataclass(frozen=True, **DATACLASS_SLOTS)
+class ValidationResult:
+    """Result of a validation check"""
+    rule_name: str
+    passed: bool
+    severity: ValidationSeverity
+    message: str
+    affected_rows: int = 0
+    details: Optional[Dict[str, Any]] = None
+
+
+class ColumnStats:
+    """
+    Column values and derived arrays shared by every rule on one column
+    
+    validate() builds one instance per column, so rules on the same column
+    reuse the numpy view, null count, string form and distinct count instead
+    of each rescanning the column.
+    """
+    
+    def __init__(self, series: pd.Series):
+        self.series = series
+    
+    @cached_property
+    def numeric_values(self) -> Optional[np.ndarray]:
+        """Numpy view of plain int/float columns, None for other dtypes"""
+        dtype = self.series.dtype
+        if isinstance(dtype, np.dtype) and dtype.kind in "iuf":
+            return self.series.to_numpy(copy=False)
+        return None
+    
+    @cached_property
+    def null_count(self) -> int:
+        """Number of null values"""
+        return int(self.series.size - self.series.count())
+    
+    @cached_property
+    def unique_count(self) -> int:
+        """Number of distinct values (nulls count as one value)"""
+        return len(pd.unique(self.series))
+    
+    @cached_property
+    def as_str(self) -> pd.Series:
+        """Values as strings (no conversion copy for null-free string columns)"""
+        # Nulls still go through astype(str) so they are matched as "None"/"nan"
+        if pd.api.types.is_string_dtype(self.series) and self.null_count == 0:
+            return self.series
+        return self.series.astype(str)
+    
+    def count_compare(self, op: Callable, bound: float) -> int:
+        """
+        Count values for which op(value, bound) holds
+        
+        Plain numpy columns use count_nonzero, which reduces the comparison
+        without going through a pandas boolean Series; other dtypes fall back
+        to pandas.
+        
+        Args:
+            op: Comparison operator (e.g. operator.lt)
+            bound: Value to compare against
+        
+        Returns:
+            Number of matching values
+        """
+        if self.numeric_values is not None:
+            return int(np.count_nonzero(op(self.numeric_values, bound)))
+        return int(op(self.series, bound).sum())
+
+
+def _bind_rule(rule: ValidationRule) -> Callable:
+    """
+    Bind a rule's settings into a closure returning its ValidationResult
+    
+    Args:
+        rule: Rule to bind
+    
+    Returns:
+        Function of (df, column_stats) producing the rule's result
+    """
+    name = rule.name
+    severity = rule.severity
+    column = rule.column
+    check_function = rule.check_function
+    uses_column_stats = rule.uses_column_stats
+    
+    if not column:
+        def run_table_check(df, column_stats):
+            passed, message, affected_rows = check_function(df)
+            return ValidationResult(name, passed, severity, message, affected_rows)
+        return run_table_check
+    
+    def run_column_check(df, column_stats):
+        stats = column_stats.get(column)
+        if stats is None:
+            if column not in df.columns:
+                return ValidationResult(
+                    name, False, ValidationSeverity.ERROR, f"Column {column} not found"
+                )
+            stats = column_stats[column] = ColumnStats(df[column])
+        
+        # Column rules get the Series (or its shared stats) without copying
+        # it into a single-column DataFrame
+        passed, message, affected_rows = check_function(
+            stats if uses_column_stats else stats.series
+        )
+        return ValidationResult(name, passed, severity, message, affected_rows)
+    return run_column_check
+
+
+class DataQualityValidator:
+    """Validates data quality according to configured rules"""
+    
+    def __init__(self, min_quality_score: float = 0.8):
+        """
+        Initialize validator
+        
+        Args:
+            min_quality_score: Minimum quality score to accept (0-1)
+        """
+        self.min_quality_score = min_quality_score
+        self.rules: List[ValidationRule] = []
+    
+    def add_rule(
+        self,
+        name: str,
+        description: str,
+        check_function: Callable,
+        severity: ValidationSeverity = ValidationSeverity.ERROR,
+        column: Optional[str] = None,
+        uses_column_stats: bool = False
+    ):
+        """
+        Add a validation rule
+        
+        Args:
+            name: Rule name
+            description: Rule description
+            check_function: Function that returns (bool, message, affected_rows);
+                called with the column Series for column rules, or the whole
+                DataFrame for table-level rules
+            severity: Severity level
+            column: Column to check (None for table-level)
+            uses_column_stats: Call the check with the column's shared
+                ColumnStats instead of the Series
+        """
+        rule = ValidationRule(
+            name=name,
+            description=description,
+            severity=severity,
+            check_function=check_function,
+            column=column,
+            uses_column_stats=uses_column_stats
+        )
+        self.rules.append(rule)
+    
+    def validate_not_null(self, column: str, severity: ValidationSeverity = ValidationSeverity.ERROR):
+        """Add a not-null validation rule"""
+        def check(stats):
+            null_count = stats.null_count
+            passed = null_count == 0
+            message = f"Found {null_count} null values in {column}" if not passed else f"All values in {column} are non-null"
+            return passed, message, null_count
+        
+        self.add_rule(
+            name=f"{column}_not_null",
+            description=f"Check that {column} contains no null values",
+            check_function=check,
+            severity=severity,
+            column=column,
+            uses_column_stats=True
+        )
+    
+    def validate_uniqueness(self, column: str, severity: ValidationSeverity = ValidationSeverity.ERROR):
+        """Add a uniqueness validation rule"""
+        def check(stats):
+            duplicate_count = len(stats.series) - stats.unique_count
+            passed = duplicate_count == 0
+            message = f"Found {duplicate_count} duplicate values in {column}" if not passed else f"All values in {column} are unique"
+            return passed, message, duplicate_count
+        
+        self.add_rule(
+            name=f"{column}_unique",
+            description=f"Check that {column} contains unique values",
+            check_function=check,
+            severity=severity,
+            column=column,
+            uses_column_stats=True
+        )
+    
+    def validate_range(
+        self,
+        column: str,
+        min_value: Optional[float] = None,
+        max_value: Optional[float] = None,
+        severity: ValidationSeverity = ValidationSeverity.ERROR
+    ):
+        """Add a range validation rule"""
+        def check(stats):
+            errors = []
+            below_min = above_max = 0
+            values = stats.numeric_values
+            if numba is not None and values is not None and values.size >= NUMBA_MIN_ROWS:
+                below_min, above_max = _count_out_of_bounds(
+                    values,
+                    min_value if min_value is not None else -np.inf,
+                    max_value if max_value is not None else np.inf
+                )
+            else:
+                if min_value is not None:
+                    below_min = stats.count_compare(operator.lt, min_value)
+                if max_value is not None:
+                    above_max = stats.count_compare(operator.gt, max_value)
+            
+            below_min = int(below_min)
+            above_max = int(above_max)
+            if below_min > 0:
+                errors.append(f"{below_min} values below minimum {min_value}")
+            if above_max > 0:
+                errors.append(f"{above_max} values above maximum {max_value}")
+            
+            total_errors = below_min + above_max
+            passed = total_errors == 0
+            message = "; ".join(errors) if errors else f"All values in {column} are within range"
+            return passed, message, total_errors
+        
+        range_desc = []
+        if min_value is not None:
+            range_desc.append(f"min={min_value}")
+        if max_value is not None:
+            range_desc.append(f"max={max_value}")
+        
+        self.add_rule(
+            name=f"{column}_range",
+            description=f"Check that {column} values are within range [{', '.join(range_desc)}]",
+            check_function=check,
+            severity=severity,
+            column=column,
+            uses_column_stats=True
+        )
+    
+    def validate_format(
+        self,
+        column: str,
+        pattern: str,
+        severity: ValidationSeverity = ValidationSeverity.ERROR
+    ):
+        """Add a format validation rule (regex pattern)"""
+        # Fail fast on an invalid pattern when the rule is registered
+        re.compile(pattern)
+        
+        def check(stats):
+            values = stats.as_str
+            # Vectorized match; empty strings are not format violations
+            invalid = (values != "") & ~values.str.match(pattern, na=False)
+            invalid_count = int(invalid.sum())
+            passed = invalid_count == 0
+            message = f"Found {invalid_count} values not matching pattern in {column}" if not passed else f"All values in {column} match pattern"
+            return passed, message, invalid_count
+        
+        self.add_rule(
+            name=f"{column}_format",
+            description=f"Check that {column} values match pattern {pattern}",
+            check_function=check,
+            severity=severity,
+            column=column,
+            uses_column_stats=True
+        )
+    
+    def validate_referential_integrity(
+        self,
+        column: str,
+        reference_df: pd.DataFrame,
+        reference_column: str,
+        severity: ValidationSeverity = ValidationSeverity.ERROR
+    ):
+        """Add a referential integrity validation rule"""
+        # Build the reference lookups once at registration, not on every validation
+        reference_values = reference_df[reference_column].dropna().unique()
+        valid_values = frozenset(reference_values)
+        valid_array = None
+        if isinstance(reference_values, np.ndarray) and reference_values.dtype.kind in "iuf":
+            valid_array = np.sort(reference_values)
+        
+        def check(stats):
+            values = stats.numeric_values
+            if values is not None and valid_array is not None:
+                # Numeric columns: membership test runs in numpy, no hashing
+                invalid_count = int(values.size - np.count_nonzero(np.isin(values, valid_array)))
+            else:
+                invalid_count = int((~stats.series.isin(valid_values)).sum())
+            passed = invalid_count == 0
+            message = f"Found {invalid_count} values not in reference table" if not passed else "All values satisfy referential integrity"
+            return passed, message, invalid_count
+        
+        self.add_rule(
+            name=f"{column}_referential_integrity",
+            description=f"Check that {column} values exist in reference table",
+            check_function=check,
+            severity=severity,
+            column=column,
+            uses_column_stats=True
+        )
+    
+    def compile_rules(self) -> Callable[..., List[ValidationResult]]:
+        """
+        Build a function that runs every current rule against a DataFrame
+        
+        The rules' bound checks are captured once, so repeated runs over the
+        same rule set skip per-rule attribute lookups. Rules added afterwards
+        are not included; compile again to pick them up.
+        
+        Returns:
+            Function mapping a DataFrame to the list of ValidationResults;
+            pass stop_on_error=True to stop after the first failed ERROR rule
+        """
+        bound_checks = tuple((rule.name, rule._bound_check) for rule in self.rules)
+        
+        def run_all(df: pd.DataFrame, stop_on_error: bool = False) -> List[ValidationResult]:
+            # One shared view per column for all rules that target it
+            column_stats: Dict[str, ColumnStats] = {}
+            results = []
+            for rule_name, bound_check in bound_checks:
+                try:
+                    result = bound_check(df, column_stats)
+                except Exception as e:
+                    result = ValidationResult(
+                        rule_name=rule_name,
+                        passed=False,
+                        severity=ValidationSeverity.ERROR,
+                        message=f"Validation error: {str(e)}"
+                    )
+                results.append(result)
+                if (
+                    stop_on_error
+                    and not result.passed
+                    and result.severity == ValidationSeverity.ERROR
+                ):
+                    break
+            return results
+        
+        return run_all
+    
+    def validate(
+        self,
+        df: pd.DataFrame,
+        fail_on_error: bool = True,
+        fast_fail: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Validate DataFrame against all rules
+        
+        Args:
+            df: DataFrame to validate
+            fail_on_error: If True, raise exception on error-level failures
+            fast_fail: With fail_on_error, raise at the first error-level
+                failure without running the remaining rules (saves their
+                scans, but the error only lists the rules run so far)
+        
+        Returns:
+            Dictionary with validation results
+        """
+        results = self.compile_rules()(df, stop_on_error=fast_fail and fail_on_error)
+        error_count = 0
+        warning_count = 0
+        
+        for result in results:
+            if not result.passed:
+                if result.severity == ValidationSeverity.ERROR:
+                    error_count += 1
+                elif result.severity == ValidationSeverity.WARNING:
+                    warning_count += 1
+        
+        # Calculate quality score
+        total_rules = len(self.rules)
+        passed_rules = sum(1 for r in results if r.passed)
+        quality_score = passed_rules / total_rules if total_rules > 0 else 0.0
+        
+        # Determine overall status
+        overall_passed = quality_score >= self.min_quality_score and error_count == 0
+        
+        validation_result = {
+            "overall_passed": overall_passed,
+            "quality_score": quality_score,
+            "total_rules": total_rules,
+            "passed_rules": passed_rules,
+            "error_count": error_count,
+            "warning_count": warning_count,
+            "results": [asdict(result) for result in results],
+            "min_quality_score": self.min_quality_score
+        }
+        
+        if fail_on_error and not overall_passed and error_count > 0:
+            error_messages = [
+                f"{r.rule_name}: {r.message}"
+                for r in results
+                if not r.passed and r.severity == ValidationSeverity.ERROR
+            ]
+            if len(results) < total_rules:
+                error_messages.append(
+                    f"(fast fail: stopped after {len(results)} of {total_rules} rules)"
+                )
+            raise ValueError(
+                f"Data quality validation failed. Quality score: {quality_score:.2%}, "
+                f"Errors: {error_count}\n" + "\n".join(error_messages)
+            )
+        
+        return validation_result
+    
+    def get_validation_summary(self, validation_result: Dict[str, Any]) -> str:
+        """Get human-readable validation summary"""
+        lines = ["Data Quality Validation Summary"]
+        lines.append("=" * 60)
+        lines.append(f"Overall Status: {'PASSED' if validation_result['overall_passed'] else 'FAILED'}")
+        lines.append(f"Quality Score: {validation_result['quality_score']:.2%}")
+        lines.append(f"Rules Passed: {validation_result['passed_rules']}/{validation_result['total_rules']}")
+        lines.append(f"Errors: {validation_result['error_count']}")
+        lines.append(f"Warnings: {validation_result['warning_count']}")
+        lines.append("\nDetailed Results:")
+        
+        for result in validation_result['results']:
+            status = "✓" if result['passed'] else "✗"
+            severity = result['severity'].value.upper()
+            lines.append(
+                f"  {status} [{severity}] {result['rule_name']}: {result['message']}"
+            )
+        
+        return "\n".join(lines)
+
@@ -0,0 +1,722 @@
+"""
+Main GDPR Governance Orchestrator
+Coordinates all compliance modules
+"""
+from typing import Optional, Dict, Any, List, Tuple
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+import threading
+
+from .config import GDPRConfig, load_config
+from .pii_detection import PIIDetector, PIIType
+from .lineage import LineageTracker, OperationType
+from .audit import AuditLogger, AuditEventType
+from .retention import RetentionManager, RetentionResults
+from .pseudonymization import Pseudonymizer
+from .k_anonymity import KAnonymityChecker
+from .data_quality import DataQualityValidator
+
+
+class GDPRGovernanceFramework:
+    """
+    Main GDPR Compliance Framework
+    Orchestrates all compliance features
+    """
+    
+    # Maximum number of tables sampled concurrently by scan_for_pii_batch
+    _PII_BATCH_WORKERS = 8
+    
+    # Maximum number of (table, version, sample size) PII scans kept in memory
+    _PII_SCAN_CACHE_SIZE = 256
+    
+    # Rows sampled for quality validation in the Spark-native pipeline
+    _NATIVE_QUALITY_SAMPLE_SIZE = 100_000
+    
+    def __init__(
+        self,
+        config: Optional[GDPRConfig] = None,
+        spark_session=None
+    ):
+        """
+        Initialize GDPR Governance Framework
+        
+        Args:
+            config: Configuration object (loads from env if None)
+            spark_session: Spark session (optional)
+        """
+        self.config = config or load_config()
+        self.spark = spark_session
+        
+        # Initialize all components
+        self.pii_detector = PIIDetector()
+        self.lineage_tracker = LineageTracker(
+            catalog=self.config.databricks_catalog,
+            schema=self.config.databricks_schema,
+            spark_session=self.spark
+        )
+        self.audit_logger = AuditLogger(
+            catalog=self.config.databricks_catalog,
+            schema=self.config.databricks_schema,
+            spark_session=self.spark
+        )
+        self.retention_manager = RetentionManager(
+            retention_years=self.config.retention_years,
+            catalog=self.config.databricks_catalog,
+            schema=self.config.databricks_schema,
+            spark_session=self.spark
+        )
+        self.pseudonymizer = Pseudonymizer(self.config.pseudonymization_key)
+        self.k_anonymity_checker = KAnonymityChecker(
+            k_threshold=self.config.k_anonymity_threshold
+        )
+        self.quality_validator = DataQualityValidator(
+            min_quality_score=self.config.min_data_quality_score
+        )
+        self._arrow_enabled = False
+        # Scans run from worker threads (daily_gdpr_checks), so the cache is
+        # only read and updated under its lock
+        self._pii_scan_cache: "OrderedDict[Tuple[str, int, int], Dict[str, List[Any]]]" = OrderedDict()
+        self._pii_scan_cache_lock = threading.Lock()
+        # Per-thread flag set while a pipeline defers log flushes
+        self._flush_state = threading.local()
+    
+    def _enable_arrow(self):
+        """Use Arrow record batches for pandas<->Spark conversions (set once per framework)"""
+        if self._arrow_enabled:
+            return
+        self.spark.conf.set("spark.sql.execution.arrow.pyspark.enabled", "true")
+        self.spark.conf.set("spark.sql.execution.arrow.pyspark.fallback.enabled", "true")
+        self._arrow_enabled = True
+    
+    @contextmanager
+    def _deferred_flush(self):
+        """
+        Defer lineage and audit flushes made inside the block to one flush on exit
+        
+        Nested steps (e.g. a PII scan inside a compliance run) skip their own
+        flushes, so a whole run writes each log table once.
+        """
+        if getattr(self._flush_state, "deferred", False):
+            # Already inside a deferred block; its owner flushes
+            yield
+            return
+        
+        self._flush_state.deferred = True
+        try:
+            yield
+        finally:
+            self._flush_state.deferred = False
+        self._flush_logs()
+    
+    def _flush_logs(self):
+        """Flush lineage and audit buffers unless flushing is deferred"""
+        if getattr(self._flush_state, "deferred", False):
+            return
+        self.lineage_tracker.flush()
+        self.audit_logger.flush()
+    
+    def scan_for_pii(
+        self,
+        table_name: str,
+        user: str = "system",
+        sample_size: int = 1000,
+        df_pandas=None
+    ) -> Dict[str, Any]:
+        """
+        Scan a table for PII
+        
+        Results of table reads are cached per Delta table version, so scanning
+        an unchanged table again skips the sample query and detection.
+        
+        Args:
+            table_name: Table to scan
+            user: User performing the scan
+            sample_size: Number of rows to sample
+            df_pandas: Already loaded pandas data for the table (optional);
+                scanned instead of reading a new sample
+        
+        Returns:
+            Dictionary with PII detection results
+        """
+        if df_pandas is not None:
+            detections = self.pii_detector.scan_dataframe(df_pandas, sample_size)
+        else:
+            if self.spark is None:
+                from pyspark.sql import SparkSession
+                self.spark = SparkSession.getActiveSession()
+            
+            if self.spark is None:
+                raise ValueError("Spark session required")
+            self._enable_arrow()
+            detections = self._scan_table(table_name, sample_size)
+        
+        result = self._build_pii_result(table_name, user, detections)
+        self._flush_logs()
+        return result
+    
+    def _scan_table(
+        self,
+        table_name: str,
+        sample_size: int,
+        max_workers: Optional[int] = None
+    ) -> Dict[str, List[Any]]:
+        """
+        Detect PII in a sample of a table, reusing the scan of its current version
+        
+        Args:
+            table_name: Table to scan
+            sample_size: Number of rows to sample
+            max_workers: Column-scan threads passed to scan_dataframe
+        
+        Returns:
+            Dictionary mapping column names to their PII detections
+        """
+        version = self._get_table_version(table_name)
+        cache_key = (table_name, version, sample_size)
+        detections = self._get_cached_scan(cache_key) if version is not None else None
+        
+        if detections is None:
+            # Read sample data; the row sample is planned by Catalyst as a
+            # scan-side limit and converted to pandas through Arrow batches
+            df_pandas = self.spark.sql(
+                f"SELECT * FROM {table_name} TABLESAMPLE ({int(sample_size)} ROWS)"
+            ).toPandas()
+            
+            # Detect PII
+            detections = self.pii_detector.scan_dataframe(
+                df_pandas, sample_size, max_workers=max_workers
+            )
+            
+            if version is not None:
+                self._cache_scan(cache_key, detections)
+        return detections
+    
+    def _get_cached_scan(self, cache_key: Tuple[str, int, int]) -> Optional[Dict[str, List[Any]]]:
+        """Cached detections for a (table, version, sample size) scan, if any"""
+        with self._pii_scan_cache_lock:
+            return self._pii_scan_cache.get(cache_key)
+    
+    def _cache_scan(self, cache_key: Tuple[str, int, int], detections: Dict[str, List[Any]]):
+        """Cache scan detections, evicting the oldest scan when full"""
+        with self._pii_scan_cache_lock:
+            self._pii_scan_cache[cache_key] = detections
+            while len(self._pii_scan_cache) > self._PII_SCAN_CACHE_SIZE:
+                self._pii_scan_cache.popitem(last=False)
+    
+    def _get_table_version(self, table_name: str) -> Optional[int]:
+        """Latest Delta version of a table, or None when it has no history (e.g. views)"""
+        try:
+            latest = self.spark.sql(f"DESCRIBE HISTORY {table_name} LIMIT 1").first()
+        except Exception:
+            return None
+        return latest["version"] if latest is not None else None
+    
+    def scan_for_pii_batch(
+        self,
+        table_names: List[str],
+        user: str = "system",
+        sample_size: int = 1000
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Scan several tables for PII concurrently
+        
+        Each table is sampled with its own column types and goes through the
+        same per-version scan cache as scan_for_pii, so results match
+        single-table scans; the tables' Spark actions overlap on a thread pool.
+        
+        Args:
+            table_names: Tables to scan
+            user: User performing the scan
+            sample_size: Number of rows to sample per table
+        
+        Returns:
+            Dictionary mapping table names to PII detection results
+            (same shape as scan_for_pii), or {"error": message} for tables
+            that could not be scanned
+        """
+        if self.spark is None:
+            from pyspark.sql import SparkSession
+            self.spark = SparkSession.getActiveSession()
+        
+        if self.spark is None:
+            raise ValueError("Spark session required")
+        self._enable_arrow()
+        
+        if not table_names:
+            return {}
+        
+        def scan(table_name):
+            # A missing table or denied read fails only that table. Tables
+            # already run in parallel, so each scans its columns on one thread
+            try:
+                return self._scan_table(table_name, sample_size, max_workers=1), None
+            except Exception as e:
+                return None, str(e)
+        
+        workers = min(self._PII_BATCH_WORKERS, len(table_names))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # map() keeps results in the requested table order
+            table_scans = list(executor.map(scan, table_names))
+        
+        results = {}
+        for table_name, (detections, error) in zip(table_names, table_scans):
+            if error is not None:
+                results[table_name] = {"error": error}
+            else:
+                results[table_name] = self._build_pii_result(table_name, user, detections)
+        
+        self._flush_logs()
+        return results
+    
+    def _build_pii_result(
+        self,
+        table_name: str,
+        user: str,
+        detections: Dict[str, List[Any]]
+    ) -> Dict[str, Any]:
+        """Record PII detections in the audit log and format the scan result"""
+        # Extract PII types and columns
+        pii_types = set()
+        pii_columns = set()
+        for column, pii_list in detections.items():
+            for pii in pii_list:
+                pii_types.add(pii.pii_type.value)
+                pii_columns.add(column)
+        
+        # Log to audit
+        if pii_types:
+            self.audit_logger.log_pii_detection(
+                table_name=table_name,
+                user=user,
+                pii_types=list(pii_types),
+                columns=list(pii_columns)
+            )
+        
+        return {
+            "table_name": table_name,
+            "pii_detected": len(detections) > 0,
+            "detections": {
+                col: [
+                    {
+                        "type": pii.pii_type.value,
+                        "confidence": pii.confidence,
+                        "row_count": pii.row_count
+                    }
+                    for pii in pii_list
+                ]
+                for col, pii_list in detections.items()
+            },
+            "summary": self.pii_detector.get_pii_summary(detections)
+        }
+    
+    def process_with_compliance(
+        self,
+        source_table: str,
+        target_table: str,
+        user: str,
+        transformations: Optional[List[str]] = None,
+        pii_columns: Optional[List[str]] = None,
+        validate_quality: bool = True,
+        ensure_k_anonymity: bool = False,
+        quasi_identifiers: Optional[List[str]] = None,
+        use_spark_native: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Process data with full GDPR compliance
+        
+        Args:
+            source_table: Source table name
+            target_table: Target table name
+            user: User performing the operation
+            transformations: List of transformation descriptions
+            pii_columns: Columns to pseudonymize (if None, auto-detect)
+            validate_quality: Whether to validate data quality
+            ensure_k_anonymity: Whether to ensure k-anonymity
+            quasi_identifiers: Columns to use for k-anonymity check
+            use_spark_native: Keep the data in Spark (pandas UDF pseudonymization,
+                window-based suppression) instead of collecting it to the driver;
+                quality rules then run on a sample of the source
+        
+        Returns:
+            Dictionary with processing results
+        """
+        if self.spark is None:
+            from pyspark.sql import SparkSession
+            self.spark = SparkSession.getActiveSession()
+        
+        if self.spark is None:
+            raise ValueError("Spark session required")
+        self._enable_arrow()
+        
+        # Lineage and audit events from every step are written once at the end
+        with self._deferred_flush():
+            results = {
+                "source_table": source_table,
+                "target_table": target_table,
+                "steps_completed": []
+            }
+            
+            # Track lineage
+            lineage_id = self.lineage_tracker.track_transform(
+                source_table=source_table,
+                target_table=target_table,
+                user=user,
+                transformation=", ".join(transformations or ["Data processing"]),
+                additional_details={"pii_columns": pii_columns}
+            )
+            results["lineage_id"] = lineage_id
+            results["steps_completed"].append("lineage_tracking")
+            
+            source_df = self.spark.sql(f"SELECT * FROM {source_table}")
+            if use_spark_native:
+                self._process_spark_native(
+                    source_df, source_table, target_table, user, pii_columns,
+                    validate_quality, ensure_k_anonymity, quasi_identifiers, results
+                )
+                return results
+            
+            # Read source data once and convert to pandas for processing (for
+            # smaller datasets); the PII scan samples the same frame
+            df_pandas = source_df.toPandas()
+            
+            # Scan for PII if columns not specified
+            if pii_columns is None:
+                pii_scan = self.scan_for_pii(source_table, user, df_pandas=df_pandas)
+                if pii_scan["pii_detected"]:
+                    # Extract columns with detected PII
+                    pii_columns = [
+                        col for col in pii_scan["detections"].keys()
+                    ]
+                    results["pii_detected"] = True
+                    results["pii_columns"] = pii_columns
+            
+            try:
+                # Data quality validation
+                if validate_quality:
+                    validation_result = self.quality_validator.validate(df_pandas, fail_on_error=True)
+                    results["quality_validation"] = validation_result
+                    results["steps_completed"].append("quality_validation")
+                
+                # Pseudonymize PII columns
+                if pii_columns:
+                    df_pandas = self.pseudonymizer.pseudonymize_multiple_columns(
+                        df_pandas,
+                        pii_columns,
+                        deterministic=True
+                    )
+                
+                    # Log pseudonymization
+                    self.audit_logger.log_pseudonymization(
+                        table_name=target_table,
+                        user=user,
+                        columns_pseudonymized=pii_columns,
+                        row_count=len(df_pandas)
+                    )
+                    results["steps_completed"].append("pseudonymization")
+                
+                # K-anonymity check and enforcement
+                if ensure_k_anonymity and quasi_identifiers:
+                    df_pandas, k_result = self.k_anonymity_checker.ensure_k_anonymity(
+                        df_pandas,
+                        quasi_identifiers,
+                        apply_suppression=True
+                    )
+                    results["k_anonymity"] = {
+                        "k_value": k_result.k_value,
+                        "compliant": k_result.is_compliant
+                    }
+                    results["steps_completed"].append("k_anonymity")
+                
+                # Write to target table
+                target_spark_df = self.spark.createDataFrame(df_pandas)
+                target_spark_df.write \
+                    .format("delta") \
+                    .mode("overwrite") \
+                    .option("overwriteSchema", "true") \
+                    .saveAsTable(target_table)
+                
+                results["steps_completed"].append("write")
+                
+            except Exception as e:
+                results["error"] = str(e)
+                raise
+        
+        return results
+    
+    def _process_spark_native(
+        self,
+        source_df,
+        source_table: str,
+        target_table: str,
+        user: str,
+        pii_columns: Optional[List[str]],
+        validate_quality: bool,
+        ensure_k_anonymity: bool,
+        quasi_identifiers: Optional[List[str]],
+        results: Dict[str, Any]
+    ):
+        """Run the compliance steps on a Spark DataFrame, filling in results"""
+        # Scan for PII if columns not specified (on a sample, as usual)
+        if pii_columns is None:
+            pii_scan = self.scan_for_pii(source_table, user)
+            if pii_scan["pii_detected"]:
+                pii_columns = list(pii_scan["detections"].keys())
+                results["pii_detected"] = True
+                results["pii_columns"] = pii_columns
+        
+        try:
+            # Data quality validation; the rules are pandas-based, so they run
+            # on a bounded sample instead of the whole table
+            if validate_quality:
+                sample_pandas = self.spark.sql(
+                    f"SELECT * FROM {source_table} "
+                    f"TABLESAMPLE ({self._NATIVE_QUALITY_SAMPLE_SIZE} ROWS)"
+                ).toPandas()
+                validation_result = self.quality_validator.validate(sample_pandas, fail_on_error=True)
+                validation_result["sampled_rows"] = len(sample_pandas)
+                results["quality_validation"] = validation_result
+                results["steps_completed"].append("quality_validation")
+            
+            result_df = source_df
+            
+            # Pseudonymize PII columns
+            if pii_columns:
+                result_df = self.pseudonymizer.pseudonymize_multiple_columns(
+                    result_df,
+                    pii_columns,
+                    deterministic=True
+                )
+                
+                # Log pseudonymization
+                self.audit_logger.log_pseudonymization(
+                    table_name=target_table,
+                    user=user,
+                    columns_pseudonymized=pii_columns,
+                    row_count=source_df.count()
+                )
+                results["steps_completed"].append("pseudonymization")
+            
+            # K-anonymity enforcement
+            if ensure_k_anonymity and quasi_identifiers:
+                result_df, k_result = self.k_anonymity_checker.ensure_k_anonymity_spark(
+                    result_df,
+                    quasi_identifiers
+                )
+                results["k_anonymity"] = {
+                    "k_value": k_result.k_value,
+                    "compliant": k_result.is_compliant
+                }
+                results["steps_completed"].append("k_anonymity")
+            
+            # Write to target table
+            result_df.write \
+                .format("delta") \
+                .mode("overwrite") \
+                .option("overwriteSchema", "true") \
+                .saveAsTable(target_table)
+            
+            results["steps_completed"].append("write")
+            
+        except Exception as e:
+            results["error"] = str(e)
+            raise
+    
+    def apply_retention_policies(self) -> RetentionResults:
+        """Apply all registered retention policies"""
+        return self.retention_manager.apply_all_policies(
+            self.audit_logger,
+            max_workers=self.config.retention_max_workers
+        )
+    
+    def create_aggregate_view(
+        self,
+        source_table: str,
+        target_view: str,
+        group_by_columns: List[str],
+        aggregate_columns: Dict[str, str],
+        user: str = "system"
+    ):
+        """
+        Create an aggregate-only view (no raw PII)
+        
+        Args:
+            source_table: Source table
+            target_view: Target view name
+            group_by_columns: Columns to group by
+            aggregate_columns: Dict of {column: aggregation_function}
+            user: User creating the view
+        """
+        if self.spark is None:
+            from pyspark.sql import SparkSession
+            self.spark = SparkSession.getActiveSession()
+        
+        if self.spark is None:
+            raise ValueError("Spark session required")
+        self._enable_arrow()
+        
+        # Aggregate in Spark so the source table never lands on the driver
+        source_df = self.spark.table(source_table)
+        try:
+            aggregated_spark_df = self.k_anonymity_checker.create_aggregate_only_view_spark(
+                source_df,
+                group_by_columns,
+                aggregate_columns
+            )
+        except ValueError:
+            # Aggregations without a Spark SQL equivalent run in pandas
+            aggregated_df = self.k_anonymity_checker.create_aggregate_only_view(
+                source_df.toPandas(),
+                group_by_columns,
+                aggregate_columns
+            )
+            aggregated_spark_df = self.spark.createDataFrame(aggregated_df)
+        
+        # Write as view
+        aggregated_spark_df.write \
+            .format("delta") \
+            .mode("overwrite") \
+            .option("overwriteSchema", "true") \
+            .saveAsTable(target_view)
+        
+        # Track lineage
+        self.lineage_tracker.track_transform(
+            source_table=source_table,
+            target_table=target_view,
+            user=user,
+            transformation="Aggregation only (no raw PII)",
+            additional_details={
+                "group_by": group_by_columns,
+                "aggregations": aggregate_columns
+            }
+        )
+        
+        # Log to audit
+        self.audit_logger.log(
+            event_type=AuditEventType.DATA_MODIFICATION,
+            table_name=target_view,
+            user=user,
+            details={
+                "operation": "create_aggregate_view",
+                "source_table": source_table,
+                "group_by": group_by_columns
+            }
+        )
+        self._flush_logs()
+    
+    def get_compliance_report(
+        self,
+        table_name: str,
+        user: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Generate a comprehensive compliance report
+        
+        Args:
+            table_name: Table to report on
+            user: Optional user filter
+        
+        Returns:
+            Dictionary with compliance information
+        """
+        return self.get_compliance_reports([table_name], user=user)[table_name]
+    
+    def get_compliance_reports(
+        self,
+        table_names: List[str],
+        user: Optional[str] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Generate compliance reports for several tables
+        
+        Each subsystem is queried once for all tables (one batched PII sample,
+        one grouped lineage count, one grouped audit count) rather than once
+        per table.
+        
+        Args:
+            table_names: Tables to report on
+            user: Optional user filter
+        
+        Returns:
+            Dictionary mapping table names to their compliance report
+        """
+        from datetime import timedelta
+        
+        table_names = list(dict.fromkeys(table_names))
+        # One clock read stamps every report and anchors the audit window
+        now = datetime.utcnow()
+        timestamp = now.isoformat()
+        reports = {
+            table_name: {
+                "table_name": table_name,
+                "timestamp": timestamp,
+                "pii_status": {},
+                "lineage": {},
+                "audit_trail": {},
+                "retention_policy": {}
+            }
+            for table_name in table_names
+        }
+        
+        with self._deferred_flush():
+            # PII scan
+            pii_scans = {}
+            if len(table_names) > 1:
+                try:
+                    # Tables that fail come back as {"error": ...} entries
+                    pii_scans = self.scan_for_pii_batch(table_names)
+                except Exception:
+                    # No usable session for the batch; scan individually below
+                    pii_scans = {}
+            for table_name in table_names:
+                if table_name not in pii_scans:
+                    try:
+                        pii_scans[table_name] = self.scan_for_pii(table_name)
+                    except Exception as e:
+                        pii_scans[table_name] = {"error": str(e)}
+                reports[table_name]["pii_status"] = pii_scans[table_name]
+            
+            # Lineage
+            try:
+                lineage_counts = self.lineage_tracker.count_lineage(table_names)
+                for table_name in table_names:
+                    reports[table_name]["lineage"] = {
+                        "upstream_count": lineage_counts[table_name]["upstream"],
+                        "downstream_count": lineage_counts[table_name]["downstream"]
+                    }
+            except Exception as e:
+                for table_name in table_names:
+                    reports[table_name]["lineage"] = {"error": str(e)}
+            
+            # Audit trail (recent)
+            try:
+                start_date = now - timedelta(days=30)
+                event_counts = self.audit_logger.count_audit_events_by_table(
+                    table_names,
+                    user=user,
+                    start_date=start_date
+                )
+                for table_name in table_names:
+                    reports[table_name]["audit_trail"] = {
+                        "recent_events_count": event_counts[table_name],
+                        "last_30_days": True
+                    }
+            except Exception as e:
+                for table_name in table_names:
+                    reports[table_name]["audit_trail"] = {"error": str(e)}
+        
+        # Retention policy
+        policies = self.retention_manager.policies
+        for table_name in table_names:
+            policy = policies.get(table_name)
+            if policy is not None:
+                reports[table_name]["retention_policy"] = {
+                    "enabled": policy.enabled,
+                    "retention_years": policy.retention_years,
+                    "date_column": policy.date_column
+                }
+            else:
+                reports[table_name]["retention_policy"] = {"registered": False}
+        
+        return reports
@@ -0,0 +1,484 @@
+"""
+K-Anonymity Protection for Analytics
+Prevents re-identification of individuals in datasets
+"""
+from typing import Any, List, Dict, Set, Optional, Tuple
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+import hashlib
+import math
+
+import numpy as np
+import pandas as pd
+
+from ._compat import DATACLASS_SLOTS
+
+
+@dataclass(frozen=True, **DATACLASS_SLOTS)
+class KAnonymityResult:
+    """Result of k-anonymity check"""
+    k_value: int
+    is_compliant: bool
+    vulnerable_combinations: List[Dict[str, Any]]
+    recommendations: List[str]
+
+
+class KAnonymityChecker:
+    """Checks and enforces k-anonymity on datasets"""
+    
+    # Memory budget for generalized string columns remembered across
+    # generalize() calls
+    _GENERALIZE_MEMO_MAX_BYTES = 64 * 1024 * 1024
+    
+    # pandas aggregation names and their Spark SQL equivalents
+    SPARK_AGGREGATIONS = {
+        "count": "count({})",
+        "sum": "sum({})",
+        "mean": "avg({})",
+        "min": "min({})",
+        "max": "max({})",
+        "median": "median({})",
+        "std": "stddev_samp({})",
+        "var": "var_samp({})",
+        "nunique": "count(DISTINCT {})",
+    }
+    
+    def __init__(self, k_threshold: int = 5):
+        """
+        Initialize k-anonymity checker
+        
+        Args:
+            k_threshold: Minimum k value required (default: 5)
+        """
+        self.k_threshold = k_threshold
+        # LRU memo of generalized string column values (and their size in
+        # bytes) keyed by content hash
+        self._generalize_memo: "OrderedDict[Tuple, Tuple[Any, int]]" = OrderedDict()
+        self._generalize_memo_bytes = 0
+    
+    def check_k_anonymity(
+        self,
+        df,
+        quasi_identifiers: List[str],
+        sensitive_attributes: Optional[List[str]] = None
+    ) -> KAnonymityResult:
+        """
+        Check k-anonymity of a dataset
+        
+        Args:
+            df: pandas DataFrame to check
+            quasi_identifiers: Columns that can be used to identify individuals
+            sensitive_attributes: Columns containing sensitive information
+        
+        Returns:
+            KAnonymityResult with compliance status
+        """
+        if not isinstance(df, pd.DataFrame):
+            raise ValueError("DataFrame must be a pandas DataFrame")
+        
+        # Check if all quasi-identifiers exist
+        missing_cols = [col for col in quasi_identifiers if col not in df.columns]
+        if missing_cols:
+            return KAnonymityResult(
+                k_value=0,
+                is_compliant=False,
+                vulnerable_combinations=[],
+                recommendations=[f"Missing columns: {missing_cols}"]
+            )
+        
+        # Count combinations of quasi-identifiers
+        combination_counts = self._compute_counts(df, quasi_identifiers)
+        return self._result_from_counts(combination_counts)
+    
+    def _compute_counts(self, df, quasi_identifiers: List[str]):
+        """Size of every quasi-identifier combination (null combinations excluded)"""
+        # observed=True: categorical keys would otherwise add zero-count
+        # groups for every unobserved combination of categories
+        return (
+            self._to_categorical(df, quasi_identifiers)
+            .groupby(quasi_identifiers, observed=True)
+            .size()
+        )
+    
+    def _to_categorical(self, df, columns: List[str]):
+        """Select columns, converting string columns to categoricals so groupby hashes int codes"""
+        subset = df[columns]
+        string_columns = {
+            col: subset[col].astype("category")
+            for col in columns
+            if pd.api.types.is_object_dtype(subset[col]) or pd.api.types.is_string_dtype(subset[col])
+        }
+        return subset.assign(**string_columns) if string_columns else subset
+    
+    def _result_from_counts(self, combination_counts) -> KAnonymityResult:
+        """Build the k-anonymity result from precomputed combination counts"""
+        # Find minimum k (smallest group size)
+        min_k = int(combination_counts.to_numpy().min()) if len(combination_counts) > 0 else 0
+        
+        # Find vulnerable combinations (groups smaller than threshold)
+        vulnerable = combination_counts[combination_counts < self.k_threshold]
+        vulnerable_combinations = vulnerable.rename('count').reset_index().to_dict('records')
+        
+        # Generate recommendations
+        recommendations = []
+        if min_k < self.k_threshold:
+            recommendations.append(
+                f"Dataset has k={min_k}, but threshold is {self.k_threshold}"
+            )
+            recommendations.append(
+                f"Found {len(vulnerable_combinations)} vulnerable combinations"
+            )
+            recommendations.append(
+                "Consider: Generalization, Suppression, or Sampling"
+            )
+        
+        return KAnonymityResult(
+            k_value=min_k,
+            is_compliant=min_k >= self.k_threshold,
+            vulnerable_combinations=vulnerable_combinations,
+            recommendations=recommendations
+        )
+    
+    def generalize(
+        self,
+        df,
+        column: str,
+        generalization_level: str = "medium"
+    ):
+        """
+        Generalize a column to improve k-anonymity
+        
+        Args:
+            df: pandas DataFrame
+            column: Column to generalize
+            generalization_level: "low", "medium", or "high"
+        
+        Returns:
+            DataFrame with generalized column
+        """
+        if column not in df.columns:
+            raise ValueError(f"Column {column} not found")
+        
+        # Shallow copy: only the generalized column is replaced, the other
+        # columns keep sharing their buffers with the input frame
+        df_copy = df.copy(deep=False)
+        series = df_copy[column]
+        
+        if pd.api.types.is_numeric_dtype(series):
+            # Generalize numeric values
+            if generalization_level == "low":
+                bucket = 10
+            elif generalization_level == "medium":
+                bucket = 100
+            else:  # high
+                bucket = 1000
+            
+            if isinstance(series.dtype, np.dtype) and series.dtype.kind in "iuf":
+                # Round down in place on a private copy: one temporary, not two
+                values = series.to_numpy(copy=True)
+                np.floor_divide(values, bucket, out=values)
+                values *= bucket
+                df_copy[column] = values
+            else:
+                # Nullable/extension dtypes keep pandas NA handling
+                df_copy[column] = (series // bucket) * bucket
+        elif pd.api.types.is_datetime64_any_dtype(series):
+            # Generalize dates
+            if generalization_level == "low":
+                df_copy[column] = pd.to_datetime(series).dt.to_period('M')
+            elif generalization_level == "medium":
+                df_copy[column] = pd.to_datetime(series).dt.to_period('Y')
+            else:  # high
+                df_copy[column] = pd.to_datetime(series).dt.to_period('Y')
+        elif generalization_level not in ("low", "medium"):  # high
+            df_copy[column] = "***"
+        else:
+            # For string columns, truncate. Only this per-value Python path
+            # is memoized: hashing a numeric or datetime column costs more
+            # than the vectorized kernels above
+            memo_key = self._generalize_memo_key(series, generalization_level)
+            cached = self._generalize_memo.get(memo_key) if memo_key is not None else None
+            if cached is not None:
+                self._generalize_memo.move_to_end(memo_key)
+                df_copy[column] = cached[0].copy()
+                return df_copy
+            
+            width = 5 if generalization_level == "low" else 3
+            df_copy[column] = series.astype(str).str[:width]
+            if memo_key is not None:
+                self._remember_generalized(memo_key, df_copy[column])
+        
+        return df_copy
+    
+    def _remember_generalized(self, memo_key: Tuple, generalized):
+        """Memoize generalized values, evicting the oldest beyond the byte budget"""
+        nbytes = int(generalized.memory_usage(deep=True, index=False))
+        if nbytes > self._GENERALIZE_MEMO_MAX_BYTES:
+            return
+        
+        self._generalize_memo[memo_key] = (generalized.array.copy(), nbytes)
+        self._generalize_memo_bytes += nbytes
+        while self._generalize_memo_bytes > self._GENERALIZE_MEMO_MAX_BYTES:
+            _, (_, evicted_bytes) = self._generalize_memo.popitem(last=False)
+            self._generalize_memo_bytes -= evicted_bytes
+    
+    def _generalize_memo_key(self, series, generalization_level: str) -> Optional[Tuple]:
+        """Content-hash key for the generalize() memo (None if values are unhashable)"""
+        try:
+            row_hashes = pd.util.hash_pandas_object(series, index=False)
+        except TypeError:
+            return None
+        # Digest of the row hashes in order: the memoized values are spliced
+        # back positionally, so a permutation must not share the key
+        content_hash = hashlib.blake2b(row_hashes.to_numpy().tobytes(), digest_size=16).digest()
+        return (generalization_level, str(series.dtype), len(series), content_hash)
+    
+    def suppress_rows(
+        self,
+        df,
+        quasi_identifiers: List[str],
+        min_group_size: int = None
+    ):
+        """
+        Suppress rows that are in groups smaller than min_group_size
+        
+        Args:
+            df: pandas DataFrame
+            quasi_identifiers: Columns used for grouping
+            min_group_size: Minimum group size (uses k_threshold if not provided)
+        
+        Returns:
+            DataFrame with suppressed rows removed
+        """
+        min_group_size = min_group_size or self.k_threshold
+        
+        # Size of each row's quasi-identifier group in one hash-groupby pass;
+        # rows with a null quasi-identifier get NaN and are suppressed
+        group_sizes = (
+            self._to_categorical(df, quasi_identifiers)
+            .groupby(quasi_identifiers, observed=True)[quasi_identifiers[0]]
+            .transform("size")
+        )
+        
+        return df[group_sizes >= min_group_size].copy()
+    
+    def ensure_k_anonymity(
+        self,
+        df,
+        quasi_identifiers: List[str],
+        generalization_strategy: Optional[Dict[str, str]] = None,
+        apply_suppression: bool = True
+    ):
+        """
+        Ensure dataset meets k-anonymity requirement
+        
+        Args:
+            df: pandas DataFrame
+            quasi_identifiers: Columns that can identify individuals
+            generalization_strategy: Dict mapping columns to generalization levels
+            apply_suppression: Whether to suppress small groups
+        
+        Returns:
+            DataFrame that meets k-anonymity requirement
+        """
+        # Generalization and suppression both return new frames, so the input
+        # is never modified and needs no upfront copy
+        result_df = df
+        
+        # Apply generalization if strategy provided
+        if generalization_strategy:
+            for column, level in generalization_strategy.items():
+                if column in result_df.columns:
+                    result_df = self.generalize(result_df, column, level)
+        
+        if any(col not in result_df.columns for col in quasi_identifiers):
+            return result_df, self.check_k_anonymity(result_df, quasi_identifiers)
+        
+        # Check k-anonymity; the counts are reused for suppression below
+        combination_counts = self._compute_counts(result_df, quasi_identifiers)
+        check_result = self._result_from_counts(combination_counts)
+        
+        # Apply suppression if needed and enabled
+        if not check_result.is_compliant and apply_suppression:
+            valid_counts = combination_counts[combination_counts >= self.k_threshold]
+            if len(quasi_identifiers) > 1:
+                row_keys = pd.MultiIndex.from_frame(result_df[quasi_identifiers])
+            else:
+                row_keys = pd.Index(result_df[quasi_identifiers[0]])
+            mask = row_keys.isin(valid_counts.index)
+            result_df = result_df[mask].copy()
+            # Surviving groups are kept whole, so their counts are unchanged
+            check_result = self._result_from_counts(valid_counts)
+        
+        return result_df, check_result
+    
+    def ensure_k_anonymity_spark(self, df, quasi_identifiers: List[str]):
+        """
+        Suppress small quasi-identifier groups in a Spark DataFrame
+        
+        Runs on the executors (window count per group), so the data never has
+        to fit on the driver. Matches the pandas suppression: rows with a null
+        quasi-identifier are dropped as well.
+        
+        Args:
+            df: Spark DataFrame
+            quasi_identifiers: Columns that can identify individuals
+        
+        Returns:
+            Tuple of (suppressed Spark DataFrame, KAnonymityResult)
+        """
+        from functools import reduce
+        from pyspark.sql import Window
+        from pyspark.sql import functions as F
+        
+        missing_cols = [col for col in quasi_identifiers if col not in df.columns]
+        if missing_cols:
+            return df, KAnonymityResult(
+                k_value=0,
+                is_compliant=False,
+                vulnerable_combinations=[],
+                recommendations=[f"Missing columns: {missing_cols}"]
+            )
+        
+        group_size_col = "_k_anonymity_group_size"
+        not_null = reduce(
+            lambda left, right: left & right,
+            [F.col(col).isNotNull() for col in quasi_identifiers]
+        )
+        result_df = (
+            df.filter(not_null)
+            .withColumn(group_size_col, F.count(F.lit(1)).over(Window.partitionBy(*quasi_identifiers)))
+            .filter(F.col(group_size_col) >= self.k_threshold)
+            .drop(group_size_col)
+        )
+        
+        # Smallest surviving group; 0 when everything was suppressed
+        min_k = (
+            result_df.groupBy(*quasi_identifiers).count()
+            .agg(F.min("count").alias("k"))
+            .first()["k"]
+        ) or 0
+        
+        recommendations = []
+        if min_k < self.k_threshold:
+            recommendations.append(
+                f"Dataset has k={min_k}, but threshold is {self.k_threshold}"
+            )
+            recommendations.append(
+                "Consider: Generalization, Suppression, or Sampling"
+            )
+        
+        return result_df, KAnonymityResult(
+            k_value=min_k,
+            is_compliant=min_k >= self.k_threshold,
+            vulnerable_combinations=[],
+            recommendations=recommendations
+        )
+    
+    def create_aggregate_only_view(
+        self,
+        df,
+        group_by_columns: List[str],
+        aggregate_columns: Dict[str, str],
+        min_group_size: int = None
+    ):
+        """
+        Create a view with only aggregations (no raw PII)
+        
+        Args:
+            df: pandas DataFrame
+            group_by_columns: Columns to group by
+            aggregate_columns: Dict of {column: aggregation_function}
+            min_group_size: Minimum group size (filters out small groups)
+        
+        Returns:
+            Aggregated DataFrame
+        """
+        min_group_size = min_group_size or self.k_threshold
+        
+        # Group and aggregate
+        grouped = df.groupby(group_by_columns)
+        
+        # Apply aggregations, counting group sizes in the same pass
+        named_aggs = {
+            col: pd.NamedAgg(column=col, aggfunc=agg_func)
+            for col, agg_func in aggregate_columns.items()
+            if col in df.columns
+        }
+        
+        if not named_aggs:
+            aggregated = grouped.size().reset_index(name='count')
+            count_column = 'count'
+        else:
+            first_column = next(iter(named_aggs))
+            aggregated = grouped.agg(
+                **named_aggs,
+                _group_count=pd.NamedAgg(column=first_column, aggfunc='size')
+            ).reset_index()
+            count_column = '_group_count'
+        
+        # Filter out small groups
+        if min_group_size:
+            aggregated = aggregated[aggregated[count_column] >= min_group_size]
+            if count_column == '_group_count':
+                aggregated = aggregated.drop(columns=['_group_count'])
+        
+        return aggregated
+    
+    def create_aggregate_only_view_spark(
+        self,
+        df,
+        group_by_columns: List[str],
+        aggregate_columns: Dict[str, str],
+        min_group_size: int = None
+    ):
+        """
+        Create an aggregate-only view of a Spark DataFrame
+        
+        Same output as create_aggregate_only_view, but the groupby runs on the
+        executors so the source never has to fit on the driver.
+        
+        Args:
+            df: Spark DataFrame
+            group_by_columns: Columns to group by
+            aggregate_columns: Dict of {column: aggregation_function}
+            min_group_size: Minimum group size (filters out small groups)
+        
+        Returns:
+            Aggregated Spark DataFrame
+        
+        Raises:
+            ValueError: If an aggregation function has no Spark SQL equivalent
+        """
+        from functools import reduce
+        from pyspark.sql import functions as F
+        
+        min_group_size = min_group_size or self.k_threshold
+        
+        aggregations = []
+        for col, agg_func in aggregate_columns.items():
+            if col in df.columns:
+                template = self.SPARK_AGGREGATIONS.get(agg_func)
+                if template is None:
+                    raise ValueError(f"Aggregation {agg_func!r} is not supported in Spark")
+                quoted = "`" + col.replace("`", "``") + "`"
+                aggregations.append(F.expr(template.format(quoted)).alias(col))
+        
+        count_column = "_group_count" if aggregations else "count"
+        aggregations.append(F.count(F.lit(1)).alias(count_column))
+        
+        # pandas groupby drops null keys
+        not_null = reduce(
+            lambda left, right: left & right,
+            [F.col(col).isNotNull() for col in group_by_columns]
+        )
+        aggregated = df.filter(not_null).groupBy(*group_by_columns).agg(*aggregations)
+        
+        # Filter out small groups
+        if min_group_size:
+            aggregated = aggregated.filter(F.col(count_column) >= min_group_size)
+            if count_column == "_group_count":
+                aggregated = aggregated.drop(count_column)
+        
+        return aggregated
+
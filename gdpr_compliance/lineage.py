@@ -0,0 +1,492 @@
+"""
+Automatic Lineage Tracking
+Tracks data flow from source to destination with complete provenance
+"""
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Any
+from dataclasses import dataclass
+from enum import Enum
+from functools import lru_cache
+import time
+import uuid
+
+import orjson
+
+from ._compat import DATACLASS_SLOTS
+
+
+class OperationType(Enum):
+    """Types of data operations"""
+    READ = "read"
+    WRITE = "write"
+    TRANSFORM = "transform"
+    COPY = "copy"
+    JOIN = "join"
+    FILTER = "filter"
+    AGGREGATE = "aggregate"
+
+
+# Stored string per operation type, looked up once per record on flush
+_OP_STR = {op: op.value for op in OperationType}
+
+
+@dataclass(**DATACLASS_SLOTS)
+class DataLineage:
+    """Represents a data lineage entry"""
+    source_table: str
+    target_table: str
+    operation_type: OperationType
+    operation_details: Dict[str, Any]
+    timestamp: datetime
+    user: str
+    job_id: Optional[str] = None
+    notebook_path: Optional[str] = None
+    lineage_id: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for storage"""
+        # Built directly: asdict() would deep-copy operation_details first
+        return {
+            'source_table': self.source_table,
+            'target_table': self.target_table,
+            'operation_type': _OP_STR[self.operation_type],
+            'operation_details': self.operation_details,
+            'timestamp': self.timestamp.isoformat(),
+            'user': self.user,
+            'job_id': self.job_id,
+            'notebook_path': self.notebook_path,
+            'lineage_id': self.lineage_id,
+        }
+    
+    def to_tuple(self) -> tuple:
+        """Convert to a row tuple in LINEAGE_COLUMNS order for storage"""
+        return (
+            self.lineage_id,
+            self.source_table,
+            self.target_table,
+            _OP_STR[self.operation_type],
+            orjson.dumps(self.operation_details, option=orjson.OPT_NON_STR_KEYS).decode(),
+            self.timestamp,
+            self.user,
+            self.job_id,
+            self.notebook_path
+        )
+
+
+# Column order of the lineage table; DataLineage.to_tuple() follows it
+LINEAGE_COLUMNS = [
+    ("lineage_id", "string"),
+    ("source_table", "string"),
+    ("target_table", "string"),
+    ("operation_type", "string"),
+    ("operation_details", "string"),
+    ("timestamp", "timestamp"),
+    ("user", "string"),
+    ("job_id", "string"),
+    ("notebook_path", "string"),
+]
+
+
+@lru_cache(maxsize=1)
+def get_lineage_schema():
+    """Build the Spark schema of the lineage table (matches LINEAGE_COLUMNS)"""
+    from pyspark.sql.types import StringType, StructField, StructType, TimestampType
+    
+    spark_types = {"string": StringType(), "timestamp": TimestampType()}
+    return StructType([
+        StructField(name, spark_types[col_type], True)
+        for name, col_type in LINEAGE_COLUMNS
+    ])
+
+
+class LineageTracker:
+    """Tracks data lineage automatically"""
+    
+    def __init__(
+        self,
+        catalog: str,
+        schema: str,
+        table_name: str = "data_lineage",
+        spark_session=None,
+        max_buffer_size: int = 1000,
+        max_buffer_age_seconds: float = 5.0
+    ):
+        """
+        Initialize lineage tracker
+        
+        Tracked entries are buffered and appended to the lineage table in one
+        Delta commit once max_buffer_size entries are waiting or the oldest one
+        is max_buffer_age_seconds old (checked when an entry is tracked), or
+        when flush() is called.
+        
+        Args:
+            catalog: Databricks catalog name
+            schema: Schema name
+            table_name: Name of lineage tracking table
+            spark_session: Spark session (optional)
+            max_buffer_size: Number of buffered entries that triggers a flush
+            max_buffer_age_seconds: Age of the oldest buffered entry that triggers a flush
+        """
+        self.catalog = catalog
+        self.schema = schema
+        self.table_name = table_name
+        self.full_table_name = f"{catalog}.{schema}.{table_name}"
+        self.spark = spark_session
+        self.max_buffer_size = max_buffer_size
+        self.max_buffer_age_seconds = max_buffer_age_seconds
+        self.lineage_history: List[DataLineage] = []
+        # Monotonic time the oldest buffered entry was tracked
+        self._buffer_started: Optional[float] = None
+    
+    def _initialize_table(self, skip_if_exists: bool = True):
+        """
+        Initialize the lineage tracking table if it doesn't exist
+        
+        Args:
+            skip_if_exists: If True, check the catalog first and skip the
+                CREATE statement (and its metastore lock) for existing tables
+        """
+        if self.spark is None:
+            from pyspark.sql import SparkSession
+            self.spark = SparkSession.getActiveSession()
+        
+        if self.spark is None:
+            raise ValueError("Spark session required for table initialization")
+        
+        if skip_if_exists and self.spark.catalog.tableExists(self.full_table_name):
+            return
+        
+        create_table_sql = f"""
+        CREATE TABLE IF NOT EXISTS {self.full_table_name} (
+            lineage_id STRING,
+            source_table STRING,
+            target_table STRING,
+            operation_type STRING,
+            operation_details STRING,
+            timestamp TIMESTAMP,
+            user STRING,
+            job_id STRING,
+            notebook_path STRING
+        ) USING DELTA
+        TBLPROPERTIES (
+            'delta.autoOptimize.optimizeWrite' = 'true',
+            'delta.autoOptimize.autoCompact' = 'true'
+        )
+        """
+        
+        self.spark.sql(create_table_sql)
+    
+    def track_read(
+        self,
+        source_table: str,
+        user: str,
+        job_id: Optional[str] = None,
+        notebook_path: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Track a read operation
+        
+        Args:
+            source_table: Source table name
+            user: User performing the operation
+            job_id: Optional job ID
+            notebook_path: Optional notebook path
+            filters: Optional filter conditions applied
+        
+        Returns:
+            Lineage ID
+        """
+        return self._new_lineage(
+            source_table=source_table,
+            target_table="",  # No target for read operations
+            operation_type=OperationType.READ,
+            operation_details={"filters": filters or {}},
+            user=user,
+            job_id=job_id,
+            notebook_path=notebook_path
+        )
+    
+    def track_write(
+        self,
+        source_table: str,
+        target_table: str,
+        user: str,
+        operation_details: Optional[Dict[str, Any]] = None,
+        job_id: Optional[str] = None,
+        notebook_path: Optional[str] = None
+    ) -> str:
+        """
+        Track a write operation
+        
+        Args:
+            source_table: Source table name
+            target_table: Target table name
+            user: User performing the operation
+            operation_details: Details about the operation
+            job_id: Optional job ID
+            notebook_path: Optional notebook path
+        
+        Returns:
+            Lineage ID
+        """
+        return self._new_lineage(
+            source_table=source_table,
+            target_table=target_table,
+            operation_type=OperationType.WRITE,
+            operation_details=operation_details or {},
+            user=user,
+            job_id=job_id,
+            notebook_path=notebook_path
+        )
+    
+    def track_transform(
+        self,
+        source_table: str,
+        target_table: str,
+        user: str,
+        transformation: str,
+        job_id: Optional[str] = None,
+        notebook_path: Optional[str] = None,
+        additional_details: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Track a transformation operation
+        
+        Args:
+            source_table: Source table name
+            target_table: Target table name
+            user: User performing the operation
+            transformation: Description of transformation
+            job_id: Optional job ID
+            notebook_path: Optional notebook path
+            additional_details: Additional operation details
+        
+        Returns:
+            Lineage ID
+        """
+        details = {
+            "transformation": transformation,
+            **(additional_details or {})
+        }
+        
+        return self._new_lineage(
+            source_table=source_table,
+            target_table=target_table,
+            operation_type=OperationType.TRANSFORM,
+            operation_details=details,
+            user=user,
+            job_id=job_id,
+            notebook_path=notebook_path
+        )
+    
+    def _new_lineage(
+        self,
+        source_table: str,
+        target_table: str,
+        operation_type: OperationType,
+        operation_details: Dict[str, Any],
+        user: str,
+        job_id: Optional[str],
+        notebook_path: Optional[str]
+    ) -> str:
+        """Create and buffer a lineage entry, returning its ID"""
+        lineage_id = uuid.uuid4().hex
+        self._buffer(DataLineage(
+            lineage_id=lineage_id,
+            source_table=source_table,
+            target_table=target_table,
+            operation_type=operation_type,
+            operation_details=operation_details,
+            timestamp=datetime.now(timezone.utc),
+            user=user,
+            job_id=job_id,
+            notebook_path=notebook_path
+        ))
+        return lineage_id
+    
+    def _buffer(self, lineage: DataLineage):
+        """Buffer an entry, flushing once the buffer is full or old enough"""
+        now = time.monotonic()
+        if not self.lineage_history:
+            self._buffer_started = now
+        self.lineage_history.append(lineage)
+        
+        if (
+            len(self.lineage_history) >= self.max_buffer_size
+            or now - self._buffer_started >= self.max_buffer_age_seconds
+        ):
+            try:
+                self.flush()
+            except Exception:
+                # Entries stay buffered for the next flush; tracking never fails
+                self._buffer_started = now
+    
+    def flush(self):
+        """Flush lineage history to the tracking table"""
+        if not self.lineage_history:
+            return
+        
+        if self.spark is None:
+            from pyspark.sql import SparkSession
+            self.spark = SparkSession.getActiveSession()
+        
+        if self.spark is None:
+            raise ValueError("Spark session required to flush lineage")
+        
+        # Initialize table if needed
+        try:
+            self._initialize_table()
+        except Exception:
+            pass  # Table might already exist
+        
+        # Rows go straight to Spark with the fixed schema (no pandas or inference)
+        rows = [lineage.to_tuple() for lineage in self.lineage_history]
+        spark_df = self.spark.createDataFrame(rows, schema=get_lineage_schema())
+        
+        # The schema is fixed by _initialize_table, so no mergeSchema
+        # (it forces a metadata read and schema check on every commit)
+        spark_df.write \
+            .format("delta") \
+            .mode("append") \
+            .saveAsTable(self.full_table_name)
+        
+        # Clear history
+        self.lineage_history = []
+        self._buffer_started = None
+    
+    def get_lineage_graph(self, table_name: str, direction: str = "downstream") -> List[Dict]:
+        """
+        Get lineage graph for a table
+        
+        Args:
+            table_name: Table to get lineage for
+            direction: "downstream" (where data goes) or "upstream" (where data comes from)
+        
+        Returns:
+            List of lineage entries
+        """
+        if self.spark is None:
+            from pyspark.sql import SparkSession
+            self.spark = SparkSession.getActiveSession()
+        
+        if self.spark is None:
+            return []
+        
+        from pyspark.sql import functions as F
+        
+        # Column predicates instead of interpolated SQL: no quoting/injection
+        # issues, and the plan shape is the same for every table
+        key_column = "source_table" if direction == "downstream" else "target_table"
+        try:
+            df = (
+                self.spark.table(self.full_table_name)
+                .filter(F.col(key_column) == table_name)
+                .orderBy(F.col("timestamp").desc())
+            )
+            return df.collect()
+        except Exception:
+            return []
+    
+    def get_complete_lineage(self, table_name: str) -> Dict[str, List]:
+        """
+        Get complete lineage (both upstream and downstream) for a table
+        
+        Both directions come from a single scan of the lineage table.
+        
+        Args:
+            table_name: Table to get lineage for
+        
+        Returns:
+            Dictionary with 'upstream' and 'downstream' lineage
+        """
+        lineage = {"upstream": [], "downstream": []}
+        
+        if self.spark is None:
+            from pyspark.sql import SparkSession
+            self.spark = SparkSession.getActiveSession()
+        
+        if self.spark is None:
+            return lineage
+        
+        from pyspark.sql import functions as F
+        
+        try:
+            rows = (
+                self.spark.table(self.full_table_name)
+                .filter((F.col("source_table") == table_name) | (F.col("target_table") == table_name))
+                .orderBy(F.col("timestamp").desc())
+                .collect()
+            )
+        except Exception:
+            return lineage
+        
+        for row in rows:
+            # A self-referencing entry belongs to both directions
+            if row["target_table"] == table_name:
+                lineage["upstream"].append(row)
+            if row["source_table"] == table_name:
+                lineage["downstream"].append(row)
+        return lineage
+    
+    def optimize(self):
+        """
+        Compact the lineage table and Z-order it by table name
+        
+        Co-locates entries for the same source/target table so the table-name
+        predicates in the lineage queries skip most files. Meant to be run
+        periodically (e.g. from a maintenance job), not per flush.
+        """
+        if self.spark is None:
+            from pyspark.sql import SparkSession
+            self.spark = SparkSession.getActiveSession()
+        
+        if self.spark is None:
+            raise ValueError("Spark session required to optimize lineage table")
+        
+        self.spark.sql(f"OPTIMIZE {self.full_table_name} ZORDER BY (source_table, target_table)")
+    
+    def count_lineage(self, table_names: List[str]) -> Dict[str, Dict[str, int]]:
+        """
+        Count upstream and downstream lineage entries for several tables at once
+        
+        One scan of the lineage table serves every table, instead of two
+        queries per table through get_complete_lineage.
+        
+        Args:
+            table_names: Tables to count lineage for
+        
+        Returns:
+            Dictionary mapping table names to {'upstream': n, 'downstream': n}
+        """
+        counts = {table_name: {"upstream": 0, "downstream": 0} for table_name in table_names}
+        if not table_names:
+            return counts
+        
+        if self.spark is None:
+            from pyspark.sql import SparkSession
+            self.spark = SparkSession.getActiveSession()
+        
+        if self.spark is None:
+            return counts
+        
+        from pyspark.sql import functions as F
+        
+        # Each lineage entry is downstream of its source and upstream of its target
+        edges = F.explode(F.array(
+            F.struct(F.col("source_table").alias("table_name"), F.lit("downstream").alias("direction")),
+            F.struct(F.col("target_table").alias("table_name"), F.lit("upstream").alias("direction"))
+        ))
+        rows = (
+            self.spark.table(self.full_table_name)
+            .filter(F.col("source_table").isin(table_names) | F.col("target_table").isin(table_names))
+            .select(edges.alias("edge"))
+            .select("edge.*")
+            .filter(F.col("table_name").isin(table_names))
+            .groupBy("table_name", "direction")
+            .count()
+            .collect()
+        )
+        for row in rows:
+            counts[row["table_name"]][row["direction"]] = row["count"]
+        return counts
@@ -0,0 +1,498 @@
+"""
+Automatic PII Detection Module
+Detects emails, phone numbers, SSNs, and other sensitive data
+"""
+import os
+import re
+import threading
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+from dataclasses import dataclass
+from enum import Enum
+
+import numpy as np
+
+try:
+    import hyperscan
+except ImportError:
+    # Optional accelerated matcher; falls back to the re module
+    hyperscan = None
+
+try:
+    import re2
+except ImportError:
+    # Optional linear-time matcher used when Hyperscan is unavailable
+    re2 = None
+
+
+class PIIType(Enum):
+    """Types of Personally Identifiable Information"""
+    EMAIL = "email"
+    PHONE = "phone"
+    SSN = "ssn"
+    CREDIT_CARD = "credit_card"
+    IP_ADDRESS = "ip_address"
+    PASSPORT = "passport"
+    DRIVER_LICENSE = "driver_license"
+    BANK_ACCOUNT = "bank_account"
+    DATE_OF_BIRTH = "date_of_birth"
+    NAME = "name"
+
+
+# Display names used in detection summaries
+_PII_NAMES = {pii_type: pii_type.value.upper() for pii_type in PIIType}
+
+
+@dataclass
+class PIIDetection:
+    """Result of PII detection"""
+    pii_type: PIIType
+    column_name: str
+    row_count: int
+    sample_values: List[str]
+    confidence: float
+
+
+class PIIDetector:
+    """Detects PII in data columns"""
+    
+    # Regex patterns for PII detection
+    PATTERNS = {
+        PIIType.EMAIL: re.compile(
+            r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
+            re.IGNORECASE
+        ),
+        PIIType.PHONE: re.compile(
+            r'(?:\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
+            r'|\+\d{1,3}\s?\d{9,14}'
+        ),
+        PIIType.SSN: re.compile(
+            r'\b\d{3}-\d{2}-\d{4}\b|\b\d{9}\b'
+        ),
+        PIIType.CREDIT_CARD: re.compile(
+            r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b'
+        ),
+        PIIType.IP_ADDRESS: re.compile(
+            r'\b(?:\d{1,3}\.){3}\d{1,3}\b'
+        ),
+        PIIType.DATE_OF_BIRTH: re.compile(
+            r'\b(?:0?[1-9]|1[0-2])[/-](?:0?[1-9]|[12]\d|3[01])[/-](?:\d{4}|\d{2})\b'
+            r'|\b(?:19|20)\d{2}[/-](?:0?[1-9]|1[0-2])[/-](?:0?[1-9]|[12]\d|3[01])\b'
+        ),
+    }
+    
+    # Every pattern above needs a digit or an '@' (keep in sync when adding
+    # patterns); values without one are skipped before the full patterns run
+    CANDIDATE_PATTERN = re.compile(r'[\d@]')
+    
+    # Patterns that can match the string form of a typed column: numbers
+    # never contain '@', '/' or three dots, and datetimes render as dates.
+    # Boolean columns are not scanned at all
+    PATTERNS_BY_DTYPE = {
+        "numeric": frozenset({PIIType.PHONE, PIIType.SSN, PIIType.CREDIT_CARD}),
+        "datetime": frozenset({PIIType.DATE_OF_BIRTH}),
+    }
+    
+    # Matching values kept per detection as examples
+    MAX_SAMPLE_VALUES = 5
+    
+    # Common name patterns (basic detection)
+    COMMON_NAMES = frozenset({
+        "john", "jane", "smith", "johnson", "williams", "brown", "jones",
+        "garcia", "miller", "davis", "rodriguez", "martinez", "hernandez"
+    })
+    
+    # Column name fragments that suggest a name field
+    NAME_INDICATORS = ('name', 'firstname', 'lastname', 'fullname', 'customer_name')
+    
+    # Multi-pattern Hyperscan database, compiled once on first use
+    _hyperscan_db = None
+    _hyperscan_local = threading.local()
+    
+    # RE2 set of all PII patterns, compiled once on first use
+    _re2_set = None
+    
+    def __init__(self, min_confidence: float = 0.7):
+        """
+        Initialize PII detector
+        
+        Args:
+            min_confidence: Minimum confidence threshold for PII detection (0-1)
+        """
+        self.min_confidence = min_confidence
+    
+    def detect_pii_in_column(
+        self,
+        column_name: str,
+        sample_values: List[str],
+        full_data_size: Optional[int] = None,
+        pii_types: Optional[FrozenSet[PIIType]] = None
+    ) -> List[PIIDetection]:
+        """
+        Detect PII in a column based on sample values
+        
+        Args:
+            column_name: Name of the column
+            sample_values: Sample values from the column
+            full_data_size: Total number of rows (for accurate counts)
+            pii_types: Only check these pattern types (defaults to all)
+        
+        Returns:
+            List of PII detections found
+        """
+        if len(sample_values) == 0:
+            return []
+        
+        counts, samples = self._match_values(sample_values, pii_types)
+        return self._build_detections(column_name, sample_values, counts, samples, full_data_size)
+    
+    def _build_detections(
+        self,
+        column_name: str,
+        sample_values: List[str],
+        counts: Dict[PIIType, int],
+        samples: Dict[PIIType, List[str]],
+        full_data_size: Optional[int] = None
+    ) -> List[PIIDetection]:
+        """Turn per-pattern match counts into detections above the confidence threshold"""
+        detections = []
+        sample_size = len(sample_values)
+        
+        # Check each PII type
+        for pii_type, match_count in counts.items():
+            if match_count:
+                match_ratio = match_count / sample_size
+                # Higher match ratio = higher confidence
+                confidence = min(match_ratio * 1.2, 1.0)
+                
+                if confidence >= self.min_confidence:
+                    row_count = full_data_size if full_data_size else sample_size
+                    detections.append(PIIDetection(
+                        pii_type=pii_type,
+                        column_name=column_name,
+                        row_count=row_count,
+                        sample_values=samples[pii_type],
+                        confidence=confidence
+                    ))
+        
+        # Check for names (less precise)
+        name_matches = self._detect_names(column_name, sample_values)
+        if name_matches:
+            detections.extend(name_matches)
+        
+        return detections
+    
+    def _match_values(
+        self,
+        sample_values: List[str],
+        pii_types: Optional[FrozenSet[PIIType]] = None
+    ) -> Tuple[Dict[PIIType, int], Dict[PIIType, List[str]]]:
+        """Count the sample values matching each PII pattern, keeping the first few"""
+        patterns = self._select_patterns(pii_types)
+        counts: Dict[PIIType, int] = dict.fromkeys(patterns, 0)
+        samples: Dict[PIIType, List[str]] = {pii_type: [] for pii_type in patterns}
+        max_samples = self.MAX_SAMPLE_VALUES
+        
+        if hyperscan is not None:
+            # One DFA pass over the whole column reports every matching pattern
+            all_types = list(self.PATTERNS)
+            values = [value for value in sample_values if value and isinstance(value, str)]
+            if not values:
+                return counts, samples
+            
+            # NUL never matches a PII pattern, so matches cannot span two values
+            encoded = [value.encode("utf-8") for value in values]
+            row_starts = []
+            offset = 0
+            for value_bytes in encoded:
+                row_starts.append(offset)
+                offset += len(value_bytes) + 1
+            buffer = b"\x00".join(encoded)
+            
+            matched: Set = set()
+            self._get_hyperscan_db().scan(
+                buffer,
+                match_event_handler=_collect_match,
+                context=matched,
+                scratch=self._get_hyperscan_scratch()
+            )
+            
+            matched_rows = {
+                (pattern_id, bisect_right(row_starts, end - 1) - 1)
+                for pattern_id, end in matched
+            }
+            for pattern_id, row in sorted(matched_rows, key=lambda item: (item[1], item[0])):
+                pii_type = all_types[pattern_id]
+                if pii_type not in counts:
+                    continue
+                counts[pii_type] += 1
+                if len(samples[pii_type]) < max_samples:
+                    samples[pii_type].append(values[row])
+            return counts, samples
+        
+        if re2 is not None:
+            # RE2 set: one linear-time pass per value reports every matching pattern
+            pattern_set = self._get_re2_set()
+            all_types = list(self.PATTERNS)
+            for value in sample_values:
+                if value and isinstance(value, str):
+                    for pattern_id in sorted(pattern_set.Match(value) or ()):
+                        pii_type = all_types[pattern_id]
+                        if pii_type not in counts:
+                            continue
+                        counts[pii_type] += 1
+                        if len(samples[pii_type]) < max_samples:
+                            samples[pii_type].append(value)
+            return counts, samples
+        
+        # A cheap character-class scan rules out values no pattern can match
+        candidate = self.CANDIDATE_PATTERN
+        for value in sample_values:
+            if value and isinstance(value, str) and candidate.search(value):
+                for pii_type, pattern in patterns.items():
+                    if pattern.search(value):
+                        counts[pii_type] += 1
+                        if len(samples[pii_type]) < max_samples:
+                            samples[pii_type].append(value)
+        return counts, samples
+    
+    def _match_series(
+        self,
+        values,
+        pii_types: Optional[FrozenSet[PIIType]] = None
+    ) -> Tuple[Dict[PIIType, int], Dict[PIIType, List[str]]]:
+        """Count matching values per PII pattern with vectorized pandas string matching"""
+        counts: Dict[PIIType, int] = {}
+        samples: Dict[PIIType, List[str]] = {}
+        try:
+            # Arrow strings run str.contains in Arrow's RE2 kernels instead of a Python loop
+            values = values.astype("string[pyarrow]")
+        except ImportError:
+            pass
+        # Only values some pattern could match are scanned per pattern
+        values = values[values.str.contains(self.CANDIDATE_PATTERN.pattern, regex=True, na=False)]
+        for pii_type, pattern in self._select_patterns(pii_types).items():
+            # Passing case instead of flags lets pandas hand the regex to Arrow's engine
+            mask = values.str.contains(
+                pattern.pattern,
+                case=not pattern.flags & re.IGNORECASE,
+                regex=True,
+                na=False
+            )
+            counts[pii_type] = int(mask.sum())
+            samples[pii_type] = values[mask].head(self.MAX_SAMPLE_VALUES).tolist()
+        return counts, samples
+    
+    @classmethod
+    def _select_patterns(cls, pii_types: Optional[FrozenSet[PIIType]] = None) -> Dict:
+        """PATTERNS restricted to the given types (all patterns when None)"""
+        if pii_types is None:
+            return cls.PATTERNS
+        return {
+            pii_type: pattern for pii_type, pattern in cls.PATTERNS.items()
+            if pii_type in pii_types
+        }
+    
+    @classmethod
+    def _pii_types_for_dtype(cls, dtype) -> Optional[FrozenSet[PIIType]]:
+        """Pattern types worth checking for a column dtype (None means all)"""
+        import pandas as pd
+        
+        # bool is checked first: pandas also reports it as numeric
+        if pd.api.types.is_bool_dtype(dtype):
+            return frozenset()
+        if pd.api.types.is_numeric_dtype(dtype):
+            return cls.PATTERNS_BY_DTYPE["numeric"]
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            return cls.PATTERNS_BY_DTYPE["datetime"]
+        return None
+    
+    @classmethod
+    def _get_hyperscan_db(cls):
+        """Compile all PII patterns into a single Hyperscan block-mode database"""
+        if cls._hyperscan_db is None:
+            expressions = []
+            flags = []
+            for pattern in cls.PATTERNS.values():
+                expressions.append(pattern.pattern.encode("utf-8"))
+                # Every match is reported so its end offset can be mapped to a row
+                pattern_flags = 0
+                if pattern.flags & re.IGNORECASE:
+                    pattern_flags |= hyperscan.HS_FLAG_CASELESS
+                flags.append(pattern_flags)
+            
+            db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+            db.compile(
+                expressions=expressions,
+                ids=list(range(len(expressions))),
+                elements=len(expressions),
+                flags=flags
+            )
+            cls._hyperscan_db = db
+        return cls._hyperscan_db
+    
+    @classmethod
+    def _get_re2_set(cls):
+        """Compile all PII patterns into a single unanchored RE2 set"""
+        if cls._re2_set is None:
+            pattern_set = re2.Set.SearchSet()
+            for pattern in cls.PATTERNS.values():
+                # Set options are shared, so case-insensitivity is set inline
+                prefix = "(?i)" if pattern.flags & re.IGNORECASE else ""
+                pattern_set.Add(prefix + pattern.pattern)
+            pattern_set.Compile()
+            cls._re2_set = pattern_set
+        return cls._re2_set
+    
+    @classmethod
+    def _get_hyperscan_scratch(cls):
+        """Per-thread Hyperscan scratch space (scratch cannot be shared by concurrent scans)"""
+        scratch = getattr(cls._hyperscan_local, "scratch", None)
+        if scratch is None:
+            scratch = hyperscan.Scratch(cls._get_hyperscan_db())
+            cls._hyperscan_local.scratch = scratch
+        return scratch
+    
+    def _detect_names(
+        self,
+        column_name: str,
+        sample_values: List[str]
+    ) -> List[PIIDetection]:
+        """Detect potential name columns"""
+        detections = []
+        
+        # Check if column name suggests it's a name field
+        lowered_column = column_name.lower()
+        if any(indicator in lowered_column for indicator in self.NAME_INDICATORS):
+            # Check if values contain common name patterns; isdisjoint tests
+            # the words against the frozenset in C and stops at the first hit
+            common_names = self.COMMON_NAMES
+            name_count = sum(
+                1 for value in sample_values
+                if value and isinstance(value, str)
+                and not common_names.isdisjoint(value.lower().split())
+            )
+            
+            if name_count > 0:
+                confidence = min(name_count / len(sample_values) * 1.5, 0.9)
+                if confidence >= self.min_confidence:
+                    detections.append(PIIDetection(
+                        pii_type=PIIType.NAME,
+                        column_name=column_name,
+                        row_count=len(sample_values),
+                        sample_values=[v for v in sample_values[:self.MAX_SAMPLE_VALUES] if v],
+                        confidence=confidence
+                    ))
+        
+        return detections
+    
+    def scan_dataframe(
+        self,
+        df,
+        sample_size: int = 1000,
+        max_workers: Optional[int] = None,
+        seed: Optional[int] = None
+    ) -> Dict[str, List[PIIDetection]]:
+        """
+        Scan a pandas DataFrame for PII
+        
+        Args:
+            df: pandas DataFrame to scan
+            sample_size: Number of rows to sample for detection
+            max_workers: Threads used to scan columns concurrently
+                (1 scans sequentially). Defaults to the CPU count when
+                Hyperscan or RE2 is installed, which release the GIL, and
+                to 1 otherwise, since re/pandas matching holds it
+            seed: Optional seed making the row sample reproducible
+        
+        Returns:
+            Dictionary mapping column names to their PII detections
+        """
+        results = {}
+        
+        # Sample data if too large. Generator.choice draws sample_size distinct
+        # rows without permuting the whole index (DataFrame.sample does), and
+        # sorted positions keep the per-column gathers sequential
+        if len(df) > sample_size:
+            rng = np.random.default_rng(seed)
+            sample_rows = np.sort(rng.choice(len(df), size=sample_size, replace=False))
+        else:
+            sample_rows = slice(None)
+        
+        full_data_size = len(df)
+        columns = list(df.columns)
+        
+        def scan_column(column):
+            # Typed columns only run the patterns their string form can match
+            pii_types = self._pii_types_for_dtype(df[column].dtype)
+            if pii_types is not None and not pii_types:
+                return []
+            
+            # Only the scanned column is sliced, never the whole frame
+            values = df[column].iloc[sample_rows].dropna().astype(str)
+            if hyperscan is None and re2 is None and len(values) > 0:
+                # No multi-pattern engine: run each pattern over the whole column in pandas
+                counts, samples = self._match_series(values, pii_types)
+                return self._build_detections(
+                    column,
+                    values.tolist(),
+                    counts,
+                    samples,
+                    full_data_size
+                )
+            return self.detect_pii_in_column(
+                column_name=column,
+                sample_values=values.tolist(),
+                full_data_size=full_data_size,
+                pii_types=pii_types
+            )
+        
+        if max_workers is None:
+            max_workers = (os.cpu_count() or 1) if hyperscan is not None or re2 is not None else 1
+        workers = min(max_workers, len(columns))
+        if workers > 1:
+            # Columns are independent; map() keeps results in column order
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                column_detections = list(executor.map(scan_column, columns))
+        else:
+            column_detections = [scan_column(column) for column in columns]
+        
+        for column, detections in zip(columns, column_detections):
+            if detections:
+                results[column] = detections
+        
+        return results
+    
+    def get_pii_summary(self, detections: Dict[str, List[PIIDetection]]) -> str:
+        """
+        Generate a human-readable summary of PII detections
+        
+        Args:
+            detections: Dictionary of detections from scan_dataframe
+        
+        Returns:
+            Formatted summary string
+        """
+        if not detections:
+            return "No PII detected."
+        
+        summary = ["PII Detection Summary:"]
+        summary.append("=" * 50)
+        
+        for column, pii_list in detections.items():
+            summary.append(f"\nColumn: {column}")
+            for detection in pii_list:
+                summary.append(
+                    f"  - {_PII_NAMES[detection.pii_type]}: "
+                    f"{detection.row_count} occurrences "
+                    f"(confidence: {detection.confidence:.2%})"
+                )
+        
+        return "\n".join(summary)
+
+
+def _collect_match(pattern_id: int, start: int, end: int, flags: int, context: Set):
+    """Hyperscan match callback: record which pattern matched and where it ended"""
+    context.add((pattern_id, end))
+    return None
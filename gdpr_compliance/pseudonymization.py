@@ -0,0 +1,347 @@
+"""
+Reversible Pseudonymization
+Securely pseudonymize PII while maintaining ability to reverse
+"""
+from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.hazmat.backends import default_backend
+import base64
+import hashlib
+import hmac
+import os
+from typing import Dict, Optional, List, Any
+
+import orjson
+
+
+class Pseudonymizer:
+    """Reversible pseudonymization using encryption"""
+    
+    def __init__(self, key: str):
+        """
+        Initialize pseudonymizer
+        
+        Args:
+            key: Base64-encoded encryption key or hex string
+                (will be converted to proper format)
+        """
+        self.key = self._prepare_key(key)
+        self._init_ciphers()
+        self.mapping_cache: Dict[str, str] = {}
+        # Pseudonym -> original, so deterministic values reverse in O(1)
+        self._reverse_mapping: Dict[str, str] = {}
+        # Mapping file last saved/loaded, and originals added since then
+        self._mapping_path: Optional[str] = None
+        self._unsaved_originals: List[str] = []
+    
+    def _init_ciphers(self):
+        """Derive the AEAD and nonce keys from the master key"""
+        raw_key = base64.urlsafe_b64decode(self.key)
+        # Fernet only decrypts pseudonyms written before the switch to AES-GCM
+        self.cipher = Fernet(self.key)
+        self._aead = AESGCM(hmac.new(raw_key, b"aead-v1", hashlib.sha256).digest())
+        self._nonce_key = hmac.new(raw_key, b"nonce-v1", hashlib.sha256).digest()
+    
+    def __getstate__(self):
+        # Cipher objects are not picklable; they are rebuilt from the key
+        state = self.__dict__.copy()
+        for name in ("cipher", "_aead", "_nonce_key"):
+            state.pop(name, None)
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_ciphers()
+    
+    def _prepare_key(self, key: str) -> bytes:
+        """
+        Prepare encryption key from various formats
+        
+        Args:
+            key: Key in hex, base64, or raw format
+        
+        Returns:
+            Base64-encoded key suitable for Fernet
+        """
+        # If already base64, try to decode to check
+        try:
+            decoded = base64.urlsafe_b64decode(key)
+            if len(decoded) == 32:
+                # Already in correct format
+                return key.encode() if isinstance(key, str) else key
+        except Exception:
+            pass
+        
+        # If hex string, convert to bytes then base64
+        try:
+            if len(key) == 64:  # 32 bytes in hex
+                key_bytes = bytes.fromhex(key)
+                return base64.urlsafe_b64encode(key_bytes)
+        except Exception:
+            pass
+        
+        # If it's a raw string, derive key using PBKDF2
+        if isinstance(key, str):
+            kdf = PBKDF2HMAC(
+                algorithm=hashes.SHA256(),
+                length=32,
+                salt=b'gdpr_compliance_salt',  # Fixed salt for consistency
+                iterations=100000,
+                backend=default_backend()
+            )
+            key_bytes = kdf.derive(key.encode())
+            return base64.urlsafe_b64encode(key_bytes)
+        
+        raise ValueError("Invalid key format")
+    
+    def pseudonymize(self, value: str, deterministic: bool = True) -> str:
+        """
+        Pseudonymize a value
+        
+        Args:
+            value: Value to pseudonymize
+            deterministic: If True, same input always produces same output
+        
+        Returns:
+            Pseudonymized value
+        """
+        if not value or not isinstance(value, str):
+            return value
+        
+        # Check cache for deterministic pseudonymization (single lookup)
+        if deterministic:
+            cached = self.mapping_cache.get(value)
+            if cached is not None:
+                return cached
+        
+        pseudonymized = self._encrypt(value.encode(), deterministic)
+        
+        # Cache for deterministic mode
+        if deterministic:
+            self.mapping_cache[value] = pseudonymized
+            self._reverse_mapping[pseudonymized] = value
+            self._unsaved_originals.append(value)
+        
+        return pseudonymized
+    
+    def _encrypt(self, value_bytes: bytes, deterministic: bool) -> str:
+        """
+        Encrypt a value into a pseudonym without touching the mapping caches
+        
+        Args:
+            value_bytes: UTF-8 encoded value
+            deterministic: If True, same input always produces same output
+        
+        Returns:
+            Pseudonymized value
+        """
+        if deterministic:
+            # Keyed BLAKE2b of the value as nonce: equal values give equal
+            # ciphertexts, and the pseudonym still decrypts with the key alone
+            nonce = hashlib.blake2b(value_bytes, key=self._nonce_key, digest_size=12).digest()
+        else:
+            nonce = os.urandom(12)
+        return base64.urlsafe_b64encode(
+            nonce + self._aead.encrypt(nonce, value_bytes, None)
+        ).decode()
+    
+    def depseudonymize(self, pseudonymized_value: str) -> str:
+        """
+        Reverse pseudonymization
+        
+        Args:
+            pseudonymized_value: Pseudonymized value to reverse
+        
+        Returns:
+            Original value
+        """
+        if not pseudonymized_value:
+            return pseudonymized_value
+        
+        try:
+            # Try to decrypt (nonce || AES-GCM ciphertext)
+            token = base64.urlsafe_b64decode(pseudonymized_value.encode())
+            return self._aead.decrypt(token[:12], token[12:], None).decode()
+        except Exception:
+            pass
+        
+        try:
+            # Pseudonyms written before the switch to AES-GCM
+            return self.cipher.decrypt(pseudonymized_value.encode()).decode()
+        except Exception:
+            # Might be a loaded deterministic mapping
+            original = self._reverse_mapping.get(pseudonymized_value)
+            if original is not None:
+                return original
+            
+            raise ValueError(f"Cannot depseudonymize value: {pseudonymized_value}")
+    
+    def pseudonymize_column(
+        self,
+        df,
+        column_name: str,
+        deterministic: bool = True,
+        spark_session=None
+    ):
+        """
+        Pseudonymize a column in a DataFrame
+        
+        Args:
+            df: Spark DataFrame or pandas DataFrame
+            column_name: Name of column to pseudonymize
+            deterministic: If True, same input always produces same output
+        
+        Returns:
+            DataFrame with pseudonymized column
+        """
+        # Check if it's a Spark DataFrame (an active session alone does not
+        # make a pandas DataFrame a Spark one)
+        if hasattr(df, 'sparkSession'):
+            return self._pseudonymize_spark_column(df, column_name, deterministic, spark_session)
+        else:
+            # Assume pandas DataFrame
+            return self._pseudonymize_pandas_column(df, column_name, deterministic)
+    
+    def _pseudonymize_pandas_column(self, df, column_name: str, deterministic: bool):
+        """Pseudonymize column in pandas DataFrame"""
+        import pandas as pd
+        
+        df_copy = df.copy()
+        df_copy[column_name] = df_copy[column_name].apply(
+            lambda x: self.pseudonymize(str(x), deterministic) if pd.notna(x) else x
+        )
+        return df_copy
+    
+    def _pseudonymize_spark_column(self, df, column_name: str, deterministic: bool, spark):
+        """Pseudonymize column in Spark DataFrame"""
+        import pandas as pd
+        from pyspark.sql.functions import pandas_udf, col
+        
+        # Vectorized UDF: values arrive in Arrow batches rather than one
+        # pickled row at a time. Only the key is captured, so the driver's
+        # mapping caches are not serialized into every task. Executors call
+        # _encrypt directly: pseudonyms depend only on key and value, and
+        # the mapping caches would keep every plaintext the worker sees
+        key = self.key
+        
+        def encrypt(pseudonymizer: Pseudonymizer, value, deterministic: bool) -> str:
+            text = str(value)
+            return pseudonymizer._encrypt(text.encode(), deterministic) if text else text
+        
+        @pandas_udf("string")
+        def pseudonymize_udf(values: pd.Series) -> pd.Series:
+            pseudonymizer = _executor_pseudonymizer(key)
+            if deterministic:
+                # Each distinct value in the batch is pseudonymized once
+                mapping = {
+                    value: encrypt(pseudonymizer, value, True)
+                    for value in values.dropna().unique()
+                }
+                return values.map(mapping)
+            return values.map(
+                lambda x: encrypt(pseudonymizer, x, False) if pd.notna(x) else None
+            )
+        
+        return df.withColumn(column_name, pseudonymize_udf(col(column_name)))
+    
+    def pseudonymize_multiple_columns(
+        self,
+        df,
+        column_names: List[str],
+        deterministic: bool = True,
+        spark_session=None
+    ):
+        """
+        Pseudonymize multiple columns
+        
+        Args:
+            df: DataFrame
+            column_names: List of column names to pseudonymize
+            deterministic: If True, same input always produces same output
+            spark_session: Spark session (for Spark DataFrames)
+        
+        Returns:
+            DataFrame with pseudonymized columns
+        """
+        result_df = df
+        for column_name in column_names:
+            result_df = self.pseudonymize_column(
+                result_df,
+                column_name,
+                deterministic,
+                spark_session
+            )
+        return result_df
+    
+    def save_mapping(self, filepath: str):
+        """
+        Save pseudonymization mapping to file (for recovery)
+        
+        The file is a JSON-lines log of [original, pseudonym] pairs. Saving
+        again to the same file only appends the entries added since the last
+        save or load; a different or missing file gets the full mapping.
+        
+        Args:
+            filepath: Mapping file path
+        """
+        if filepath != self._mapping_path or not os.path.exists(filepath):
+            self.compact_mapping(filepath)
+            return
+        
+        with open(filepath, 'ab') as f:
+            f.write(b"".join(
+                orjson.dumps([original, self.mapping_cache[original]]) + b"\n"
+                for original in self._unsaved_originals
+            ))
+        self._unsaved_originals = []
+    
+    def compact_mapping(self, filepath: str):
+        """Rewrite the mapping file with one line per current mapping entry"""
+        with open(filepath, 'wb') as f:
+            f.write(b"".join(
+                orjson.dumps([original, pseudonym]) + b"\n"
+                for original, pseudonym in self.mapping_cache.items()
+            ))
+        self._mapping_path = filepath
+        self._unsaved_originals = []
+    
+    def load_mapping(self, filepath: str):
+        """
+        Load pseudonymization mapping from file
+        
+        Reads the JSON-lines log written by save_mapping (later lines win) as
+        well as the single JSON object written by earlier versions.
+        
+        Args:
+            filepath: Mapping file path
+        """
+        with open(filepath, 'rb') as f:
+            content = f.read()
+        
+        legacy = content.lstrip().startswith(b"{")
+        if legacy:
+            self.mapping_cache = orjson.loads(content)
+        else:
+            self.mapping_cache = dict(
+                orjson.loads(line) for line in content.splitlines() if line.strip()
+            )
+        self._reverse_mapping = {
+            pseudonym: original for original, pseudonym in self.mapping_cache.items()
+        }
+        # A legacy file can't be appended to; the next save rewrites it
+        self._mapping_path = None if legacy else filepath
+        self._unsaved_originals = []
+
+
+# Pseudonymizers reused across Spark UDF batches in an executor process
+_EXECUTOR_PSEUDONYMIZERS: Dict[bytes, Pseudonymizer] = {}
+
+
+def _executor_pseudonymizer(key: bytes) -> Pseudonymizer:
+    """Get the executor-local Pseudonymizer for a key, creating it on first use"""
+    pseudonymizer = _EXECUTOR_PSEUDONYMIZERS.get(key)
+    if pseudonymizer is None:
+        pseudonymizer = _EXECUTOR_PSEUDONYMIZERS[key] = Pseudonymizer(key)
+    return pseudonymizer
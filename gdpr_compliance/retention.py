@@ -0,0 +1,888 @@
+"""
+7-Year Retention Policy Enforcement
+Automatically deletes data older than retention period
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from itertools import chain
+from typing import Callable, List, Optional, Dict, Any, Set, Tuple
+from dataclasses import dataclass, field
+
+import re
+import time
+
+from dateutil.relativedelta import relativedelta
+
+
+# Partition value format per partition granularity; partitions whose value
+# sorts before the cutoff in this format hold only expired rows
+PARTITION_FORMATS = {
+    "day": "%Y-%m-%d",
+    "month": "%Y-%m",
+    "year": "%Y",
+}
+
+
+# Unquoted SQL identifier, and a table name of up to three of them
+IDENTIFIER_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+TABLE_NAME_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*){0,2}$')
+
+
+# Columns soft deletes maintain. is_deleted lets readers filter live rows
+# (is_deleted IS NOT TRUE) on a boolean whose file statistics skip files
+SOFT_DELETE_COLUMNS = {
+    "deleted_at": "TIMESTAMP",
+    "is_deleted": "BOOLEAN",
+}
+
+# Attempts for a DELETE or UPDATE that loses a concurrent Delta commit; the
+# wait before retry n is 2**n seconds
+COMMIT_ATTEMPTS = 3
+
+
+def is_concurrent_append(error: Exception) -> bool:
+    """
+    Whether an error is a Delta ConcurrentAppendException
+    
+    Matched by class name and message so delta-spark is not required.
+    
+    Args:
+        error: Exception raised by spark.sql
+    
+    Returns:
+        True if the statement lost a commit conflict and can be retried
+    """
+    return (
+        type(error).__name__ == "ConcurrentAppendException"
+        or "ConcurrentAppendException" in str(error)
+    )
+
+
+def is_missing_soft_delete_column(error: Exception) -> bool:
+    """
+    Whether an error is an AnalysisException about a missing soft delete column
+    
+    Args:
+        error: Exception raised by spark.sql
+    
+    Returns:
+        True if a SOFT_DELETE_COLUMNS column could not be resolved
+    """
+    message = str(error)
+    return (
+        type(error).__name__ == "AnalysisException"
+        and ("cannot resolve" in message or "UNRESOLVED_COLUMN" in message)
+        and any(name in message for name in SOFT_DELETE_COLUMNS)
+    )
+
+
+# Layout of get_policy_summary
+SUMMARY_SEPARATOR = "=" * 60
+POLICY_SUMMARY_TEMPLATE = (
+    "\nTable: {table_name}\n"
+    "  Date Column: {date_column}\n"
+    "  Retention: {retention_years} years\n"
+    "  Status: {status}\n"
+    "  Delete Type: {delete_type}"
+)
+
+
+def quote_identifier(name: str, pattern=IDENTIFIER_PATTERN) -> str:
+    """
+    Validate a (dotted) SQL identifier and backtick-quote each part
+    
+    Args:
+        name: Identifier such as 'event_date' or 'catalog.schema.table'
+        pattern: Pattern the whole name must match
+    
+    Returns:
+        Quoted identifier, e.g. `catalog`.`schema`.`table`
+    """
+    if not isinstance(name, str) or not pattern.match(name):
+        raise ValueError(f"Invalid SQL identifier: {name!r}")
+    return ".".join(f"`{part}`" for part in name.split("."))
+
+
+def align_cutoff(cutoff_date: datetime, granularity: str) -> datetime:
+    """
+    Round a retention cutoff down to the start of its day, month or year
+    
+    A cutoff on a partition (or file clustering) boundary lets whole files
+    be skipped or dropped; rows between the aligned and exact cutoff are kept
+    slightly longer, never deleted early.
+    
+    Args:
+        cutoff_date: Exact cutoff
+        granularity: 'day', 'month' or 'year'
+    
+    Returns:
+        Aligned cutoff
+    """
+    aligned = cutoff_date.replace(hour=0, minute=0, second=0, microsecond=0)
+    if granularity == "month":
+        aligned = aligned.replace(day=1)
+    elif granularity == "year":
+        aligned = aligned.replace(month=1, day=1)
+    return aligned
+
+
+@dataclass
+class RetentionPolicy:
+    """Retention policy configuration"""
+    table_name: str
+    date_column: str
+    retention_years: int
+    enabled: bool = True
+    soft_delete: bool = False  # If True, marks as deleted instead of hard delete
+    partition_column: Optional[str] = None  # date_column, or a partition column derived from it
+    partition_granularity: str = "day"  # Period the cutoff is aligned to: day, month or year
+    deletion_vectors: bool = False  # Deletes write deletion vectors; purged by optimize_retention_tables
+    # Maps a date to the partition_column value holding it (derived partitions)
+    partition_expr: Optional[Callable[[datetime], str]] = None
+    _quoted_table: str = field(init=False, repr=False, compare=False)
+    _quoted_date_column: str = field(init=False, repr=False, compare=False)
+    _quoted_partition_column: Optional[str] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Validated and quoted once; every retention statement reuses them
+        self._quoted_table = quote_identifier(self.table_name, TABLE_NAME_PATTERN)
+        self._quoted_date_column = quote_identifier(self.date_column)
+        self._quoted_partition_column = None
+        if self.partition_column is not None:
+            self._quoted_partition_column = quote_identifier(self.partition_column)
+        if self.partition_expr is not None and self.partition_column is None:
+            raise ValueError("partition_expr requires partition_column")
+
+
+@dataclass
+class RetentionResults:
+    """
+    Per-table results of a retention run, stored column-wise
+    
+    Each list holds one entry per table in run order, so totals and reports
+    work on whole columns (e.g. sum(results.rows_deleted) or to_pandas())
+    instead of walking a dict per table.
+    """
+    tables: List[str] = field(default_factory=list)
+    statuses: List[str] = field(default_factory=list)
+    rows_deleted: List[int] = field(default_factory=list)
+    cutoff_dates: List[Optional[str]] = field(default_factory=list)
+    messages: List[Optional[str]] = field(default_factory=list)
+    details: List[Dict[str, Any]] = field(default_factory=list)  # Full result dict per table
+    
+    def __len__(self) -> int:
+        return len(self.tables)
+    
+    def append(self, table_name: str, result: Dict[str, Any]):
+        """Add the result dict returned by apply_retention for a table"""
+        self.tables.append(table_name)
+        self.statuses.append(result.get("status", "unknown"))
+        self.rows_deleted.append(result.get("rows_deleted", 0))
+        self.cutoff_dates.append(result.get("cutoff_date"))
+        self.messages.append(result.get("message"))
+        self.details.append(result)
+    
+    @property
+    def total_rows_deleted(self) -> int:
+        """Rows deleted across all tables"""
+        return sum(self.rows_deleted)
+    
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Dictionary mapping table names to their result dicts"""
+        return dict(zip(self.tables, self.details))
+    
+    def to_pandas(self):
+        """One row per table with table, status, rows_deleted, cutoff_date and message"""
+        import pandas as pd
+        
+        return pd.DataFrame({
+            "table": self.tables,
+            "status": self.statuses,
+            "rows_deleted": self.rows_deleted,
+            "cutoff_date": self.cutoff_dates,
+            "message": self.messages,
+        })
+
+
+class RetentionManager:
+    """Manages data retention policies"""
+    
+    def __init__(
+        self,
+        retention_years: int = 7,
+        catalog: str = "gdpr_compliance",
+        schema: str = "governance",
+        spark_session=None,
+        min_date_ttl_seconds: float = 3600.0,
+        result_cache_ttl_seconds: float = 3600.0,
+        clock: Optional[Callable[[], datetime]] = None
+    ):
+        """
+        Initialize retention manager
+        
+        Args:
+            retention_years: Default retention period in years
+            catalog: Databricks catalog name
+            schema: Schema name
+            spark_session: Spark session (optional)
+            min_date_ttl_seconds: How long a table's oldest date is reused
+                before hard-delete runs probe it again
+            result_cache_ttl_seconds: How long a run that found nothing to
+                delete is reused by later runs with the same cutoff
+            clock: Returns the current UTC time (defaults to datetime.utcnow);
+                drives cutoffs and cache expiry
+        """
+        self.retention_years = retention_years
+        self.catalog = catalog
+        self.schema = schema
+        self.spark = spark_session
+        self.policies: Dict[str, RetentionPolicy] = {}
+        # Records tables already clustered by their date column
+        self.clustered_table_name = f"{catalog}.{schema}.retention_clustered"
+        self._clustered_table_initialized = False
+        # Clustering method applied per table ('cluster_by' or 'zorder')
+        self._clustering: Dict[str, str] = {}
+        # Partition columns per table, read once from DESCRIBE DETAIL
+        self._partition_columns: Dict[str, List[str]] = {}
+        self._now: Callable[[], datetime] = clock or datetime.utcnow
+        # Oldest date per table as (time read, value)
+        self.min_date_ttl_seconds = min_date_ttl_seconds
+        self._min_dates: Dict[str, Tuple[datetime, Any]] = {}
+        # Latest nothing-to-delete result per table as (cutoff, time stored,
+        # result); one entry per table, so older cutoffs don't accumulate
+        self.result_cache_ttl_seconds = result_cache_ttl_seconds
+        self._result_cache: Dict[str, Tuple[str, datetime, Dict[str, Any]]] = {}
+        # Tables known to have the columns used by soft deletes
+        self._soft_delete_ready: Set[str] = set()
+    
+    def _resolve_spark(self):
+        """
+        Resolve the Spark session on first use
+        
+        The active session is looked up (a JVM gateway call) only until one is
+        found; after that the stored session is returned directly.
+        
+        Returns:
+            Spark session, or None if no session is active
+        """
+        if self.spark is None:
+            from pyspark.sql import SparkSession
+            self.spark = SparkSession.getActiveSession()
+        return self.spark
+    
+    def register_policy(
+        self,
+        table_name: str,
+        date_column: str,
+        retention_years: Optional[int] = None,
+        enabled: bool = True,
+        soft_delete: bool = False,
+        partition_column: Optional[str] = None,
+        partition_granularity: str = "day",
+        cluster: bool = False,
+        deletion_vectors: bool = False,
+        partition_expr: Optional[Callable[[datetime], str]] = None
+    ):
+        """
+        Register a retention policy for a table
+        
+        Args:
+            table_name: Full table name (catalog.schema.table)
+            date_column: Column containing the date to check
+            retention_years: Retention period (uses default if not provided)
+            enabled: Whether policy is enabled
+            soft_delete: If True, mark as deleted instead of hard delete
+            partition_column: Partition column of the table: the date column
+                itself (detected from the table when not provided), or a
+                column derived from it together with partition_expr
+            partition_granularity: Period covered by one partition value
+                ('day', 'month' or 'year'); the cutoff is rounded down to it
+            cluster: If True, cluster the table by date_column (see
+                ensure_clustering) when a Spark session is available
+            deletion_vectors: If True, enable Delta deletion vectors on the
+                table (when a Spark session is available) so retention
+                deletes mark rows instead of rewriting files; run
+                optimize_retention_tables periodically to purge them
+            partition_expr: Function mapping a date to the partition_column
+                value of the partition holding it (e.g. lambda d:
+                d.strftime('%Y%m') for monthly partitions). Deletes then
+                also filter on the partition column, so only partitions up
+                to the cutoff's are read; the rows deleted are unchanged
+        
+        Raises:
+            ValueError: If a name is not a valid SQL identifier, the
+                partition granularity is unsupported, or partition_expr is
+                given without partition_column
+        """
+        if partition_granularity not in PARTITION_FORMATS:
+            raise ValueError(
+                f"Unsupported partition granularity '{partition_granularity}'. "
+                f"Supported: {', '.join(PARTITION_FORMATS)}"
+            )
+        
+        policy = RetentionPolicy(
+            table_name=table_name,
+            date_column=date_column,
+            retention_years=retention_years or self.retention_years,
+            enabled=enabled,
+            soft_delete=soft_delete,
+            partition_column=partition_column,
+            partition_granularity=partition_granularity,
+            deletion_vectors=deletion_vectors,
+            partition_expr=partition_expr
+        )
+        self.policies[table_name] = policy
+        # Results and oldest dates cached under a previous policy (possibly
+        # on another date column) no longer apply
+        self._result_cache.pop(table_name, None)
+        self._min_dates.pop(table_name, None)
+        
+        if cluster or deletion_vectors:
+            if self._resolve_spark() is not None:
+                if deletion_vectors:
+                    self.spark.sql(
+                        f"ALTER TABLE {policy._quoted_table} "
+                        "SET TBLPROPERTIES ('delta.enableDeletionVectors' = 'true')"
+                    )
+                if cluster:
+                    self.ensure_clustering(table_name)
+    
+    def _initialize_clustered_table(self):
+        """Create the table recording clustered tables if it doesn't exist"""
+        if self._clustered_table_initialized:
+            return
+        
+        create_table_sql = f"""
+        CREATE TABLE IF NOT EXISTS {self.clustered_table_name} (
+            table_name STRING,
+            date_column STRING,
+            method STRING,
+            clustered_at TIMESTAMP
+        ) USING DELTA
+        """
+        
+        self.spark.sql(create_table_sql)
+        self._clustered_table_initialized = True
+    
+    def ensure_clustering(self, table_name: str) -> bool:
+        """
+        Cluster a table by its retention date column, once per table
+        
+        Retention deletes are range predicates on the date column; clustered
+        files have tight min/max ranges on it, so Delta skips most of them.
+        Uses liquid clustering (ALTER TABLE ... CLUSTER BY), or a Z-order
+        OPTIMIZE where the table layout doesn't allow it. Tables partitioned
+        by the date column are left alone. Clustered tables are recorded in
+        clustered_table_name so re-registration doesn't cluster again.
+        
+        Args:
+            table_name: Table with a registered retention policy
+        
+        Returns:
+            True if the table was clustered by this call
+        """
+        if self._resolve_spark() is None:
+            raise ValueError("Spark session required to cluster a table")
+        
+        policy = self.policies[table_name]
+        if self._is_partitioned_by_date(policy):
+            # Partition pruning already confines retention deletes
+            return False
+        
+        self._initialize_clustered_table()
+        args = {"table_name": table_name, "date_column": policy.date_column}
+        marker = self.spark.sql(
+            f"""
+            SELECT method FROM {self.clustered_table_name}
+            WHERE table_name = :table_name AND date_column = :date_column
+            LIMIT 1
+            """,
+            args=args
+        ).first()
+        if marker is not None:
+            self._clustering[table_name] = marker[0]
+            return False
+        
+        try:
+            # Liquid clustering: later writes and OPTIMIZE runs cluster incrementally
+            self.spark.sql(f"ALTER TABLE {policy._quoted_table} CLUSTER BY ({policy._quoted_date_column})")
+            method = "cluster_by"
+        except Exception:
+            # Partitioned (by another column) tables can't use liquid clustering
+            self.spark.sql(f"OPTIMIZE {policy._quoted_table} ZORDER BY ({policy._quoted_date_column})")
+            method = "zorder"
+        
+        self.spark.sql(
+            f"""
+            INSERT INTO {self.clustered_table_name}
+            VALUES (:table_name, :date_column, :method, current_timestamp())
+            """,
+            args={**args, "method": method}
+        )
+        self._clustering[table_name] = method
+        return True
+    
+    def force_optimize(self, table_name: str, horizon_days: int = 30):
+        """
+        Compact the files the next retention runs will delete from
+        
+        Tables partitioned by the date column only optimize partitions
+        expiring within horizon_days; other tables are optimized (and
+        re-clustered) as a whole. Meant for a maintenance job, not every run.
+        
+        Args:
+            table_name: Table with a registered retention policy
+            horizon_days: Days past the current cutoff to include
+        """
+        if self._resolve_spark() is None:
+            raise ValueError("Spark session required to optimize a table")
+        
+        policy = self.policies[table_name]
+        if self._is_partitioned_by_date(policy):
+            _, cutoff_date = self._cutoff_dates(policy)
+            horizon = (cutoff_date + timedelta(days=horizon_days)).strftime("%Y-%m-%d")
+            # OPTIMIZE only accepts partition predicates, which this is
+            self.spark.sql(f"OPTIMIZE {policy._quoted_table} WHERE {policy._quoted_date_column} < '{horizon}'")
+        elif self._clustering.get(table_name) == "zorder":
+            self.spark.sql(f"OPTIMIZE {policy._quoted_table} ZORDER BY ({policy._quoted_date_column})")
+        else:
+            self.spark.sql(f"OPTIMIZE {policy._quoted_table}")
+    
+    def optimize_retention_tables(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Purge deletion vectors left by retention deletes
+        
+        Rewrites the files of every deletion-vector policy table without
+        the rows marked deleted (REORG TABLE ... APPLY (PURGE)), so the
+        deleted data is physically removed and storage can be reclaimed by
+        VACUUM. Meant to be scheduled off-peak, e.g. weekly.
+        
+        Returns:
+            Dictionary mapping table names to results
+        """
+        if self._resolve_spark() is None:
+            raise ValueError("Spark session required to optimize tables")
+        
+        results = {}
+        for table_name, policy in self.policies.items():
+            if not policy.deletion_vectors:
+                continue
+            try:
+                self.spark.sql(f"REORG TABLE {policy._quoted_table} APPLY (PURGE)")
+                results[table_name] = {"status": "success"}
+            except Exception as e:
+                results[table_name] = {"status": "error", "message": str(e)}
+        return results
+    
+    def _get_partition_columns(self, policy: RetentionPolicy) -> List[str]:
+        """Partition columns of a policy's Delta table (cached per table)"""
+        if policy.table_name not in self._partition_columns:
+            detail = self.spark.sql(f"DESCRIBE DETAIL {policy._quoted_table}").select("partitionColumns").first()
+            self._partition_columns[policy.table_name] = list(detail[0] or []) if detail else []
+        return self._partition_columns[policy.table_name]
+    
+    def _is_partitioned_by_date(self, policy: RetentionPolicy) -> bool:
+        """Whether a policy's table is partitioned by its date column"""
+        if policy.partition_column is not None:
+            return policy.partition_column == policy.date_column
+        return policy.date_column in self._get_partition_columns(policy)
+    
+    def _has_expired_rows(self, policy: RetentionPolicy, cutoff_date_str: str) -> bool:
+        """
+        Check a table's oldest date against the cutoff without scanning data
+        
+        Delta answers MIN over a column from file statistics, so this is a
+        metadata lookup; the value is reused for min_date_ttl_seconds.
+        
+        Args:
+            policy: Retention policy of the table
+            cutoff_date_str: Cutoff date (YYYY-MM-DD)
+        
+        Returns:
+            True if the table may hold rows older than the cutoff
+        """
+        now = self._now()
+        cached = self._min_dates.get(policy.table_name)
+        if cached is None or (now - cached[0]).total_seconds() > self.min_date_ttl_seconds:
+            row = self.spark.sql(
+                f"SELECT min({policy._quoted_date_column}) FROM {policy._quoted_table}"
+            ).first()
+            cached = (now, row[0] if row else None)
+            self._min_dates[policy.table_name] = cached
+        
+        min_date = cached[1]
+        return min_date is not None and str(min_date) < cutoff_date_str
+    
+    def _cutoff_dates(
+        self,
+        policy: RetentionPolicy,
+        now: Optional[datetime] = None
+    ) -> Tuple[datetime, datetime]:
+        """
+        Compute a policy's retention cutoff
+        
+        Calendar years are subtracted so leap days don't shift the cutoff,
+        which is then aligned down to the policy's partition granularity.
+        
+        Args:
+            policy: Retention policy
+            now: Current time (read from the clock if not provided)
+        
+        Returns:
+            Tuple of (exact cutoff, aligned cutoff used for deletion)
+        """
+        exact_cutoff_date = (now or self._now()) - relativedelta(years=policy.retention_years)
+        return exact_cutoff_date, align_cutoff(exact_cutoff_date, policy.partition_granularity)
+    
+    def _expired_partitions(
+        self,
+        policy: RetentionPolicy,
+        cutoff_date: datetime
+    ) -> Optional[List[str]]:
+        """
+        List the partitions of a table partitioned by its date column that
+        end before the cutoff
+        
+        Args:
+            policy: Retention policy of the table
+            cutoff_date: Rows dated before this are expired
+        
+        Returns:
+            Expired partition values, or None if the table is not partitioned
+            by the policy's date column
+        """
+        if not self._is_partitioned_by_date(policy):
+            return None
+        
+        cutoff_value = cutoff_date.strftime(PARTITION_FORMATS[policy.partition_granularity])
+        partitions = self.spark.sql(f"SHOW PARTITIONS {policy._quoted_table}").select(policy.date_column).collect()
+        return [
+            str(row[0]) for row in partitions
+            if row[0] is not None and str(row[0]) < cutoff_value
+        ]
+    
+    def _ensure_soft_delete_columns(self, policy: RetentionPolicy):
+        """
+        Make sure a table has the columns used by soft deletes
+        
+        The schema is checked once per table; missing SOFT_DELETE_COLUMNS are
+        added in one ALTER and later soft deletes go straight to the UPDATE.
+        Rows soft-deleted before is_deleted existed only carry deleted_at, so
+        is_deleted is backfilled from it; otherwise the reader filter
+        is_deleted IS NOT TRUE would return them as live rows.
+        
+        Args:
+            policy: Retention policy of the table to check
+        
+        Raises:
+            Exception: If a column is missing and cannot be added; the soft
+                delete fails rather than falling back to a hard delete
+        """
+        if policy.table_name in self._soft_delete_ready:
+            return
+        
+        existing = set(self.spark.table(policy._quoted_table).columns)
+        missing = [
+            f"{name} {col_type}" for name, col_type in SOFT_DELETE_COLUMNS.items()
+            if name not in existing
+        ]
+        if missing:
+            self.spark.sql(f"ALTER TABLE {policy._quoted_table} ADD COLUMNS ({', '.join(missing)})")
+        if "deleted_at" in existing:
+            # Idempotent, so a run interrupted after the ALTER is completed
+            # by the next one; live rows keep is_deleted NULL
+            self._run_with_retry(f"""
+            UPDATE {policy._quoted_table}
+            SET is_deleted = true
+            WHERE is_deleted IS NULL
+              AND deleted_at IS NOT NULL
+              AND deleted_at <> '1970-01-01'
+            """, {})
+        self._soft_delete_ready.add(policy.table_name)
+    
+    def _run_with_retry(self, query: str, args: Dict[str, Any]):
+        """
+        Run a DELETE or UPDATE, retrying when it loses a concurrent commit
+        
+        Only ConcurrentAppendException is retried, with exponential backoff;
+        any other error is raised on the first attempt.
+        
+        Args:
+            query: Statement to run
+            args: Named parameter values of the statement
+        
+        Returns:
+            DataFrame returned by spark.sql
+        """
+        for attempt in range(COMMIT_ATTEMPTS):
+            try:
+                return self.spark.sql(query, args=args)
+            except Exception as e:
+                if attempt == COMMIT_ATTEMPTS - 1 or not is_concurrent_append(e):
+                    raise
+                time.sleep(2 ** attempt)
+    
+    def _soft_delete(self, policy: RetentionPolicy, predicate: str, args: Dict[str, Any]):
+        """
+        Stamp deleted_at and flag rows matching a predicate not yet is_deleted
+        
+        If the columns vanished since they were checked (the table was
+        replaced), they are added again and the UPDATE is retried once.
+        
+        Args:
+            policy: Retention policy of the table
+            predicate: WHERE clause selecting expired rows
+            args: Named parameter values of the predicate
+        
+        Returns:
+            DataFrame returned by spark.sql
+        """
+        update_query = f"""
+        UPDATE {policy._quoted_table}
+        SET deleted_at = CURRENT_TIMESTAMP(), is_deleted = true
+        WHERE {predicate}
+          AND is_deleted IS NOT TRUE
+        """
+        self._ensure_soft_delete_columns(policy)
+        try:
+            return self._run_with_retry(update_query, args)
+        except Exception as e:
+            if not is_missing_soft_delete_column(e):
+                raise
+            self._soft_delete_ready.discard(policy.table_name)
+            self._ensure_soft_delete_columns(policy)
+            return self._run_with_retry(update_query, args)
+    
+    def _affected_rows(self, result, table_name: str, metric: str) -> int:
+        """
+        Number of rows changed by a DELETE or UPDATE statement
+        
+        Args:
+            result: DataFrame returned by spark.sql for the statement
+            table_name: Quoted name of the table the statement changed
+            metric: Delta operation metric to read when the statement does not
+                report num_affected_rows (numDeletedRows or numUpdatedRows)
+        
+        Returns:
+            Affected row count
+        """
+        row = result.first() if result is not None else None
+        if row is not None and "num_affected_rows" in row.asDict():
+            return int(row["num_affected_rows"])
+        
+        # Older runtimes return no metrics; read them from the commit just made
+        history = self.spark.sql(f"DESCRIBE HISTORY {table_name} LIMIT 1").select("operationMetrics").first()
+        metrics = (history[0] if history else None) or {}
+        return int(metrics.get(metric, 0))
+    
+    def _cache_no_rows(
+        self,
+        table_name: str,
+        cutoff_date_str: str,
+        now: datetime,
+        message: str
+    ) -> Dict[str, Any]:
+        """Build a nothing-to-delete result and cache it for the table and cutoff"""
+        result = {
+            "status": "success",
+            "rows_deleted": 0,
+            "message": message
+        }
+        self._result_cache[table_name] = (cutoff_date_str, now, result)
+        return dict(result)
+    
+    def apply_retention(
+        self,
+        table_name: str,
+        audit_logger=None,
+        flush_audit: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Apply retention policy to a table
+        
+        Args:
+            table_name: Table to apply retention to
+            audit_logger: Optional audit logger instance
+            flush_audit: If True, write the audit event before returning;
+                batch callers pass False and flush once themselves
+        
+        Returns:
+            Dictionary with results (rows_deleted, etc.)
+        """
+        if table_name not in self.policies:
+            return {
+                "status": "error",
+                "message": f"No retention policy registered for {table_name}"
+            }
+        
+        policy = self.policies[table_name]
+        
+        if not policy.enabled:
+            return {
+                "status": "skipped",
+                "message": f"Retention policy disabled for {table_name}"
+            }
+        
+        if self._resolve_spark() is None:
+            return {
+                "status": "error",
+                "message": "Spark session required"
+            }
+        
+        try:
+            # Calculate cutoff date
+            now = self._now()
+            exact_cutoff_date, cutoff_date = self._cutoff_dates(policy, now)
+            cutoff_date_str = cutoff_date.strftime("%Y-%m-%d")
+            
+            # A recent run with the same cutoff found nothing to delete;
+            # scheduled sweeps reuse it until it expires
+            cached = self._result_cache.get(table_name)
+            if (
+                cached is not None
+                and cached[0] == cutoff_date_str
+                and (now - cached[1]).total_seconds() <= self.result_cache_ttl_seconds
+            ):
+                return dict(cached[2])
+            
+            # Soft-deleted rows stay in the table, so only hard deletes can
+            # rule out expired rows from the oldest date
+            if not policy.soft_delete and not self._has_expired_rows(policy, cutoff_date_str):
+                return self._cache_no_rows(table_name, cutoff_date_str, now, "No expired rows (metadata check)")
+            
+            # When the table is partitioned by the date column, whole expired
+            # partitions are deleted: a predicate on partition values only
+            # lets Delta drop their files from the log without rewriting any.
+            # Values are bound as named parameters, never spliced into the SQL
+            expired_partitions = self._expired_partitions(policy, cutoff_date)
+            if expired_partitions is None:
+                predicate = f"{policy._quoted_date_column} < :cutoff"
+                args = {"cutoff": cutoff_date_str}
+                if policy.partition_expr is not None:
+                    # Redundant hint on the derived partition column so the
+                    # pruner skips later partitions; <= keeps the cutoff's own
+                    # partition, whose rows the date predicate still filters
+                    predicate = f"{policy._quoted_partition_column} <= :partition_cutoff AND {predicate}"
+                    args["partition_cutoff"] = policy.partition_expr(cutoff_date)
+            elif expired_partitions:
+                args = {f"partition_{i}": value for i, value in enumerate(expired_partitions)}
+                predicate = f"{policy._quoted_date_column} IN ({', '.join(':' + name for name in args)})"
+            else:
+                return self._cache_no_rows(table_name, cutoff_date_str, now, "No rows to delete")
+            
+            # Apply deletion; affected rows come from the statement's own
+            # metrics, so the predicate is evaluated once. A failed soft
+            # delete is reported as an error, never turned into a hard delete
+            if policy.soft_delete:
+                rows_deleted = self._affected_rows(
+                    self._soft_delete(policy, predicate, args), policy._quoted_table, "numUpdatedRows"
+                )
+            else:
+                delete_query = f"""
+                DELETE FROM {policy._quoted_table}
+                WHERE {predicate}
+                """
+                rows_deleted = self._affected_rows(
+                    self._run_with_retry(delete_query, args), policy._quoted_table, "numDeletedRows"
+                )
+            
+            # The oldest date changed; probe it again next time
+            self._min_dates.pop(policy.table_name, None)
+            
+            if rows_deleted == 0:
+                return self._cache_no_rows(table_name, cutoff_date_str, now, "No rows to delete")
+            
+            # Log to audit
+            if audit_logger:
+                audit_logger.log_retention_applied(
+                    table_name=table_name,
+                    rows_deleted=rows_deleted,
+                    retention_years=policy.retention_years,
+                    cutoff_date=cutoff_date_str,
+                    exact_cutoff_date=exact_cutoff_date.isoformat()
+                )
+                if flush_audit:
+                    audit_logger.flush()
+            
+            result = {
+                "status": "success",
+                "rows_deleted": rows_deleted,
+                "cutoff_date": cutoff_date_str,
+                "exact_cutoff_date": exact_cutoff_date.isoformat(),
+                "retention_years": policy.retention_years
+            }
+            if expired_partitions:
+                result["partitions_deleted"] = len(expired_partitions)
+            return result
+        
+        except Exception as e:
+            return {
+                "status": "error",
+                "message": str(e)
+            }
+    
+    def apply_all_policies(
+        self,
+        audit_logger=None,
+        max_workers: int = 8
+    ) -> RetentionResults:
+        """
+        Apply retention policies to all registered tables
+        
+        Tables are independent, so their deletes are submitted to Spark
+        concurrently instead of waiting on each table's commit in turn. The
+        audit events of the whole run are flushed once at the end.
+        
+        Args:
+            audit_logger: Optional audit logger instance
+            max_workers: Maximum number of tables processed concurrently
+                (1 applies policies sequentially)
+        
+        Returns:
+            RetentionResults with one entry per table (as_dict() gives the
+            table name -> result mapping)
+        """
+        def apply(table_name):
+            return self.apply_retention(table_name, audit_logger, flush_audit=False)
+        
+        table_names = list(self.policies)
+        workers = min(max_workers, len(table_names))
+        try:
+            if workers > 1:
+                # Resolve the session once rather than in every worker
+                self._resolve_spark()
+                
+                # map() keeps results in registration order
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    table_results = list(executor.map(apply, table_names))
+            else:
+                table_results = [apply(table_name) for table_name in table_names]
+        finally:
+            if audit_logger:
+                audit_logger.flush()
+        
+        results = RetentionResults()
+        for table_name, result in zip(table_names, table_results):
+            results.append(table_name, result)
+        return results
+    
+    def get_policy_summary(self) -> str:
+        """Get summary of all retention policies"""
+        if not self.policies:
+            return "No retention policies registered."
+        
+        return "\n".join(chain(
+            ("Retention Policies:", SUMMARY_SEPARATOR),
+            (self._format_policy(policy) for policy in self.policies.values())
+        ))
+    
+    @staticmethod
+    def _format_policy(policy: RetentionPolicy) -> str:
+        """Format one policy for get_policy_summary"""
+        return POLICY_SUMMARY_TEMPLATE.format(
+            table_name=policy.table_name,
+            date_column=policy.date_column,
+            retention_years=policy.retention_years,
+            status="Enabled" if policy.enabled else "Disabled",
+            delete_type="Soft Delete" if policy.soft_delete else "Hard Delete"
+        )
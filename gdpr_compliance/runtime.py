@@ -0,0 +1,62 @@
+"""
+Shared Job Runtime Bootstrap
+Creates the Spark session, configuration and framework once per process
+"""
+from functools import lru_cache
+
+from .config import load_config
+from .governance import GDPRGovernanceFramework
+
+
+# Session-level tuning applied to every job: Arrow for pandas<->Spark
+# conversions and adaptive execution to coalesce small shuffle partitions
+SPARK_RUNTIME_CONF = {
+    "spark.sql.execution.arrow.pyspark.enabled": "true",
+    "spark.sql.execution.arrow.pyspark.fallback.enabled": "true",
+    "spark.sql.adaptive.enabled": "true",
+    "spark.sql.adaptive.coalescePartitions.enabled": "true",
+}
+
+
+def _configure_session(spark) -> None:
+    """
+    Apply runtime SQL settings to a Spark session
+
+    Args:
+        spark: SparkSession to configure
+    """
+    for key, value in SPARK_RUNTIME_CONF.items():
+        spark.conf.set(key, value)
+    
+    # Size the initial shuffle to the cluster; AQE coalesces it further
+    try:
+        parallelism = spark.sparkContext.defaultParallelism
+    except Exception:
+        # sparkContext is not exposed on shared access mode clusters
+        return
+    spark.conf.set("spark.sql.shuffle.partitions", str(max(parallelism * 2, 8)))
+
+
+@lru_cache(maxsize=None)
+def init_framework(app_name: str) -> GDPRGovernanceFramework:
+    """
+    Initialize the compliance framework for a job (cached per app name)
+
+    Args:
+        app_name: Spark application name used when no session is active
+
+    Returns:
+        GDPRGovernanceFramework bound to the active Spark session
+    """
+    from pyspark.sql import SparkSession
+
+    spark = SparkSession.getActiveSession()
+    if spark is None:
+        # The scheduler mode is a core setting and can only be set at startup
+        spark = SparkSession.builder \
+            .appName(app_name) \
+            .config("spark.scheduler.mode", "FAIR") \
+            .getOrCreate()
+    _configure_session(spark)
+
+    return GDPRGovernanceFramework(config=load_config(), spark_session=spark)
@@ -2,27 +2,25 @@
 Compliance Report Generation Job
 Generates comprehensive compliance reports for specified tables
 """
-import sys
-import json
 from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from src.config import load_config
-from src.governance import GDPRGovernanceFramework
-
 
 def main():
     """Main job function for compliance reporting"""
     import argparse
     
     parser = argparse.ArgumentParser(description="GDPR Compliance Reporting")
-    parser.add_argument(
+    tables_group = parser.add_mutually_exclusive_group(required=True)
+    tables_group.add_argument(
         "--tables",
         nargs="+",
-        required=True,
         help="Tables to generate reports for"
     )
+    tables_group.add_argument(
+        "--tables-file",
+        type=Path,
+        help="File listing table names separated by whitespace or newlines"
+    )
     parser.add_argument(
         "--output-path",
         help="Path to save report JSON (optional)"
@@ -33,44 +31,53 @@ def main():
     )
     
     args = parser.parse_args()
+    if args.tables_file:
+        # Bulk table lists are read from a file to avoid argv length limits
+        try:
+            args.tables = args.tables_file.read_text().split()
+        except OSError as e:
+            parser.error(f"cannot read --tables-file: {e}")
+        if not args.tables:
+            parser.error(f"no tables listed in {args.tables_file}")
     
-    print(f"Generating compliance reports for {len(args.tables)} table(s)...")
-    
-    # Load configuration
-    config = load_config()
-    
-    # Initialize framework
-    from pyspark.sql import SparkSession
-    spark = SparkSession.getActiveSession()
+    # Heavy imports (PySpark via the framework) are deferred until arguments
+    # are valid so --help and usage errors return immediately
+    from gdpr_compliance.runtime import init_framework
     
-    if spark is None:
-        spark = SparkSession.builder.appName("GDPR_Compliance_Report").getOrCreate()
+    print(f"Generating compliance reports for {len(args.tables)} table(s)...")
     
-    framework = GDPRGovernanceFramework(config=config, spark_session=spark)
+    # Initialize framework (reuses the active Spark session)
+    framework = init_framework("GDPR_Compliance_Report")
     
-    reports = {}
+    # Each subsystem is queried once for all tables
+    try:
+        reports = framework.get_compliance_reports(args.tables, user=args.user)
+    except Exception as e:
+        reports = {table: {"error": str(e)} for table in args.tables}
     
-    for table in args.tables:
-        print(f"\nGenerating report for {table}...")
-        try:
-            report = framework.get_compliance_report(table, user=args.user)
-            reports[table] = report
-            
-            # Print summary
-            print(f"  PII Status: {'Detected' if report['pii_status'].get('pii_detected') else 'None'}")
-            print(f"  Upstream Sources: {report['lineage'].get('upstream_count', 0)}")
-            print(f"  Downstream Targets: {report['lineage'].get('downstream_count', 0)}")
-            print(f"  Recent Audit Events: {report['audit_trail'].get('recent_events_count', 0)}")
-            print(f"  Retention Policy: {'Registered' if report['retention_policy'].get('registered', True) else 'Not Registered'}")
+    for table, report in reports.items():
+        print(f"\nReport for {table}:")
+        if "error" in report:
+            print(f"  ✗ Error: {report['error']}")
+            continue
         
-        except Exception as e:
-            print(f"  ✗ Error: {str(e)}")
-            reports[table] = {"error": str(e)}
+        # Print summary
+        print(f"  PII Status: {'Detected' if report['pii_status'].get('pii_detected') else 'None'}")
+        print(f"  Upstream Sources: {report['lineage'].get('upstream_count', 0)}")
+        print(f"  Downstream Targets: {report['lineage'].get('downstream_count', 0)}")
+        print(f"  Recent Audit Events: {report['audit_trail'].get('recent_events_count', 0)}")
+        print(f"  Retention Policy: {'Registered' if report['retention_policy'].get('registered', True) else 'Not Registered'}")
     
     # Save to file if requested
     if args.output_path:
-        with open(args.output_path, 'w') as f:
-            json.dump(reports, f, indent=2, default=str)
+        import orjson
+        Path(args.output_path).write_bytes(
+            orjson.dumps(
+                reports,
+                default=str,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY
+            )
+        )
         print(f"\nReports saved to {args.output_path}")
     
     return reports
@@ -2,41 +2,30 @@
 Daily GDPR Compliance Checks Job
 Runs automated compliance checks and applies retention policies
 """
-import sys
 import os
-from pathlib import Path
-
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from src.config import load_config
-from src.governance import GDPRGovernanceFramework
-from src.audit import AuditEventType
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 
 def main():
     """Main job function"""
-    print("Starting Daily GDPR Compliance Checks...")
-    
-    # Load configuration
-    config = load_config()
+    from gdpr_compliance.runtime import init_framework
+    from gdpr_compliance.audit import AuditEventType
     
-    # Initialize framework (will get Spark session from context)
-    from pyspark.sql import SparkSession
-    spark = SparkSession.getActiveSession()
-    
-    if spark is None:
-        spark = SparkSession.builder.appName("GDPR_Daily_Checks").getOrCreate()
+    print("Starting Daily GDPR Compliance Checks...")
     
-    framework = GDPRGovernanceFramework(config=config, spark_session=spark)
+    # Initialize framework (reuses the active Spark session)
+    framework = init_framework("GDPR_Daily_Checks")
     
     print("\n1. Applying Retention Policies...")
     retention_results = framework.apply_retention_policies()
     
-    for table, result in retention_results.items():
-        status = result.get("status", "unknown")
-        rows_deleted = result.get("rows_deleted", 0)
+    for table, status, rows_deleted in zip(
+        retention_results.tables,
+        retention_results.statuses,
+        retention_results.rows_deleted
+    ):
         print(f"  {table}: {status}, {rows_deleted} rows deleted")
+    print(f"  Total: {retention_results.total_rows_deleted} rows deleted")
     
     print("\n2. Scanning Registered Tables for PII...")
     # You can configure which tables to scan
@@ -46,35 +35,61 @@ def main():
         # "catalog.schema.table2",
     ]
     
-    for table in tables_to_scan:
-        try:
-            pii_result = framework.scan_for_pii(table, user="system")
-            if pii_result["pii_detected"]:
-                print(f"  ⚠️  PII detected in {table}")
-                for col, detections in pii_result["detections"].items():
-                    print(f"     - {col}: {len(detections)} types")
-            else:
-                print(f"  ✓ No PII detected in {table}")
-        except Exception as e:
-            print(f"  ✗ Error scanning {table}: {str(e)}")
+    scan_results = {}
+    if tables_to_scan:
+        with ThreadPoolExecutor(max_workers=min(8, len(tables_to_scan))) as executor:
+            futures = {
+                executor.submit(framework.scan_for_pii, table, user="system"): table
+                for table in tables_to_scan
+            }
+            
+            for future in as_completed(futures):
+                table = futures[future]
+                try:
+                    pii_result = future.result()
+                    scan_results[table] = {
+                        "status": "success",
+                        "pii_detected": pii_result["pii_detected"]
+                    }
+                    if pii_result["pii_detected"]:
+                        print(f"  ⚠️  PII detected in {table}")
+                        for col, detections in pii_result["detections"].items():
+                            print(f"     - {col}: {len(detections)} types")
+                    else:
+                        print(f"  ✓ No PII detected in {table}")
+                except Exception as e:
+                    scan_results[table] = {"status": "error", "error": str(e)}
+                    print(f"  ✗ Error scanning {table}: {str(e)}")
     
     print("\n3. Validating Data Quality...")
     # Add your quality checks here
     
     print("\nDaily GDPR Compliance Checks Completed!")
     
-    # Log completion
-    framework.audit_logger.log(
-        event_type=AuditEventType.USER_ACTION,
-        table_name="system",
-        user="system",
-        details={
+    # Log per-table scan outcomes and completion in one batch
+    job_id = os.environ.get("DATABRICKS_JOB_ID", "unknown")
+    audit_events = [
+        {
+            "event_type": AuditEventType.USER_ACTION,
+            "table_name": table,
+            "user": "system",
+            "details": {"action": "daily_pii_scan", **scan_status},
+            "job_id": job_id
+        }
+        for table, scan_status in scan_results.items()
+    ]
+    audit_events.append({
+        "event_type": AuditEventType.USER_ACTION,
+        "table_name": "system",
+        "user": "system",
+        "details": {
             "action": "daily_gdpr_checks",
             "status": "completed",
-            "retention_results": retention_results
+            "retention_results": retention_results.as_dict()
         },
-        job_id=os.environ.get("DATABRICKS_JOB_ID", "unknown")
-    )
+        "job_id": job_id
+    })
+    framework.audit_logger.log_bulk(audit_events)
     framework.audit_logger.flush()
 
 
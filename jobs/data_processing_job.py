@@ -2,14 +2,7 @@
 Data Processing Job with GDPR Compliance
 Processes data with automatic compliance checks
 """
-import sys
 import os
-from pathlib import Path
-
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from src.config import load_config
-from src.governance import GDPRGovernanceFramework
 
 
 def main():
@@ -40,22 +33,22 @@ def main():
         action="store_true",
         help="Skip data quality validation"
     )
+    parser.add_argument(
+        "--spark-native",
+        action="store_true",
+        help="Process in Spark without collecting the table to the driver"
+    )
     
     args = parser.parse_args()
     
-    print(f"Processing {args.source_table} -> {args.target_table} with GDPR compliance...")
-    
-    # Load configuration
-    config = load_config()
+    # Heavy imports (PySpark via the framework) are deferred until arguments
+    # are valid so --help and usage errors return immediately
+    from gdpr_compliance.runtime import init_framework
     
-    # Initialize framework
-    from pyspark.sql import SparkSession
-    spark = SparkSession.getActiveSession()
-    
-    if spark is None:
-        spark = SparkSession.builder.appName("GDPR_Data_Processing").getOrCreate()
+    print(f"Processing {args.source_table} -> {args.target_table} with GDPR compliance...")
     
-    framework = GDPRGovernanceFramework(config=config, spark_session=spark)
+    # Initialize framework (reuses the active Spark session)
+    framework = init_framework("GDPR_Data_Processing")
     
     try:
         result = framework.process_with_compliance(
@@ -65,7 +58,8 @@ def main():
             pii_columns=args.pii_columns,
             validate_quality=not args.skip_quality_check,
             ensure_k_anonymity=args.ensure_k_anonymity,
-            quasi_identifiers=args.quasi_identifiers
+            quasi_identifiers=args.quasi_identifiers,
+            use_spark_native=args.spark_native
         )
         
         print("\n✓ Processing completed successfully!")
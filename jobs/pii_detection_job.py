@@ -2,27 +2,26 @@
 PII Detection Job
 Scans specified tables for PII and registers findings
 """
-import sys
 import os
 from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from src.config import load_config
-from src.governance import GDPRGovernanceFramework
-
 
 def main():
     """Main job function for PII detection"""
     import argparse
     
     parser = argparse.ArgumentParser(description="PII Detection Job")
-    parser.add_argument(
+    tables_group = parser.add_mutually_exclusive_group(required=True)
+    tables_group.add_argument(
         "--tables",
         nargs="+",
-        required=True,
         help="Tables to scan for PII"
     )
+    tables_group.add_argument(
+        "--tables-file",
+        type=Path,
+        help="File listing table names separated by whitespace or newlines"
+    )
     parser.add_argument(
         "--sample-size",
         type=int,
@@ -31,42 +30,45 @@ def main():
     )
     
     args = parser.parse_args()
+    if args.tables_file:
+        # Bulk table lists are read from a file to avoid argv length limits
+        try:
+            args.tables = args.tables_file.read_text().split()
+        except OSError as e:
+            parser.error(f"cannot read --tables-file: {e}")
+        if not args.tables:
+            parser.error(f"no tables listed in {args.tables_file}")
     
-    print(f"Starting PII Detection for {len(args.tables)} table(s)...")
-    
-    # Load configuration
-    config = load_config()
-    
-    # Initialize framework
-    from pyspark.sql import SparkSession
-    spark = SparkSession.getActiveSession()
+    # Heavy imports (PySpark via the framework) are deferred until arguments
+    # are valid so --help and usage errors return immediately
+    from gdpr_compliance.runtime import init_framework
     
-    if spark is None:
-        spark = SparkSession.builder.appName("GDPR_PII_Detection").getOrCreate()
+    print(f"Starting PII Detection for {len(args.tables)} table(s)...")
     
-    framework = GDPRGovernanceFramework(config=config, spark_session=spark)
+    # Initialize framework (reuses the active Spark session)
+    framework = init_framework("GDPR_PII_Detection")
     
-    results = {}
+    try:
+        # Sample the tables concurrently
+        results = framework.scan_for_pii_batch(
+            table_names=args.tables,
+            user="system",
+            sample_size=args.sample_size
+        )
+    except Exception as e:
+        # Reported per table below
+        results = {table: {"error": str(e)} for table in args.tables}
     
-    for table in args.tables:
-        print(f"\nScanning {table}...")
-        try:
-            result = framework.scan_for_pii(
-                table_name=table,
-                user="system",
-                sample_size=args.sample_size
-            )
-            results[table] = result
-            
-            if result["pii_detected"]:
-                print(f"  ⚠️  PII DETECTED in {table}")
-                print(f"  {result['summary']}")
-            else:
-                print(f"  ✓ No PII detected in {table}")
-        
-        except Exception as e:
-            print(f"  ✗ Error: {str(e)}")
-            results[table] = {"error": str(e)}
+    for table, result in results.items():
+        print(f"\nScanned {table}")
+        if "error" in result:
+            print(f"  ✗ Error: {result['error']}")
+            continue
+        if result["pii_detected"]:
+            print(f"  ⚠️  PII DETECTED in {table}")
+            print(f"  {result['summary']}")
+        else:
+            print(f"  ✓ No PII detected in {table}")
     
     print(f"\nPII Detection completed for {len(args.tables)} table(s)")
     return results
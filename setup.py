@@ -23,13 +23,18 @@ setup(
         "pyspark>=3.5.0",
         "cryptography>=42.0.0",
         "pandas>=2.0.0",
+        "pyarrow>=10.0.0",
         "python-dateutil>=2.8.0",
         "sqlalchemy>=2.0.0",
-        "pyyaml>=6.0",
+        "pyyaml>=6.0",  # uses libyaml (CSafeLoader) when PyYAML is built with it
         "pydantic>=2.0.0",
         "faker>=20.0.0",
         "tqdm>=4.66.0",
+        "orjson>=3.9.0",
     ],
+    extras_require={
+        "fast": ["hyperscan>=0.4.0", "google-re2>=1.0", "numba>=0.57.0"],
+    },
     entry_points={
         "console_scripts": [
             "gdpr-deploy=deploy:main",
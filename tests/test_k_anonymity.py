@@ -0,0 +1,23 @@
+import pandas as pd
+
+from gdpr_compliance.k_anonymity import KAnonymityChecker
+
+
+def test_generalize_memo_respects_row_order():
+    checker = KAnonymityChecker()
+    
+    first = checker.generalize(pd.DataFrame({"age": [25, 130]}), "age", "low")
+    second = checker.generalize(pd.DataFrame({"age": [130, 25]}), "age", "low")
+    
+    assert first["age"].tolist() == [20, 130]
+    assert second["age"].tolist() == [130, 20]
+
+
+def test_generalize_memo_respects_row_order_for_strings():
+    checker = KAnonymityChecker()
+    
+    first = checker.generalize(pd.DataFrame({"name": ["alice", "bob"]}), "name", "medium")
+    second = checker.generalize(pd.DataFrame({"name": ["bob", "alice"]}), "name", "medium")
+    
+    assert first["name"].tolist() == ["ali", "bob"]
+    assert second["name"].tolist() == ["bob", "ali"]
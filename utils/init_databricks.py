@@ -2,15 +2,48 @@
 Utility script to initialize Databricks tables for GDPR compliance
 Run this once to set up the governance tables
 """
-import sys
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from src.config import load_config
+from gdpr_compliance.config import load_config
 from pyspark.sql import SparkSession
 
 
+# pii_registry table properties. Deletion vectors make row-level deletes
+# and updates mark rows instead of rewriting files (they need reader 3 /
+# writer 7); statistics are kept for the leading id, table, column and PII
+# type columns the registry is filtered by
+PII_REGISTRY_PROPERTIES = {
+    "delta.autoOptimize.optimizeWrite": "true",
+    "delta.autoOptimize.autoCompact": "true",
+    "delta.enableDeletionVectors": "true",
+    "delta.dataSkippingNumIndexedCols": "4",
+    "delta.columnMapping.mode": "name",
+    "delta.minReaderVersion": "3",
+    "delta.minWriterVersion": "7",
+}
+
+
+def _exists(spark, kind: str, name: str, parent: Optional[str] = None) -> bool:
+    """
+    Check whether a catalog, schema or table exists
+    
+    SHOW ... LIKE only reads the metastore, so re-runs against an
+    initialized workspace skip the DDL and the locks it takes.
+    
+    Args:
+        spark: Spark session
+        kind: CATALOGS, SCHEMAS or TABLES
+        name: Object name (without its parent)
+        parent: Catalog or schema the object lives in
+    
+    Returns:
+        True if the object exists
+    """
+    in_parent = f" IN {parent}" if parent else ""
+    return bool(spark.sql(f"SHOW {kind}{in_parent} LIKE '{name}'").take(1))
+
+
 def main():
     """Initialize Databricks tables"""
     print("Initializing GDPR Compliance Tables in Databricks...")
@@ -28,36 +61,33 @@ def main():
     full_schema = f"{catalog}.{schema}"
     
     print(f"\n1. Creating catalog: {catalog}")
-    spark.sql(f"CREATE CATALOG IF NOT EXISTS {catalog}")
+    if not _exists(spark, "CATALOGS", catalog):
+        spark.sql(f"CREATE CATALOG IF NOT EXISTS {catalog}")
     spark.sql(f"USE CATALOG {catalog}")
     
     print(f"2. Creating schema: {full_schema}")
-    spark.sql(f"CREATE SCHEMA IF NOT EXISTS {full_schema}")
+    if not _exists(spark, "SCHEMAS", schema, parent=catalog):
+        spark.sql(f"CREATE SCHEMA IF NOT EXISTS {full_schema}")
     spark.sql(f"USE SCHEMA {full_schema}")
     
-    # Initialize components to create tables
-    print("\n3. Initializing governance components...")
-    from src.audit import AuditLogger
-    from src.lineage import LineageTracker
+    # Components whose tables are created below
+    from gdpr_compliance.audit import AuditLogger
+    from gdpr_compliance.lineage import LineageTracker
     
     audit_logger = AuditLogger(
         catalog=catalog,
         schema=schema,
         spark_session=spark
     )
-    audit_logger._initialize_table()
-    print("   ✓ Audit logs table created")
-    
     lineage_tracker = LineageTracker(
         catalog=catalog,
         schema=schema,
         spark_session=spark
     )
-    lineage_tracker._initialize_table()
-    print("   ✓ Data lineage table created")
     
-    # Create PII registry table
-    print("\n4. Creating PII registry table...")
+    pii_registry_properties = ", ".join(
+        f"'{key}' = '{value}'" for key, value in PII_REGISTRY_PROPERTIES.items()
+    )
     pii_registry_sql = f"""
     CREATE TABLE IF NOT EXISTS {full_schema}.pii_registry (
         registry_id STRING,
@@ -69,21 +99,52 @@ def main():
         row_count BIGINT,
         user STRING
     ) USING DELTA
-    TBLPROPERTIES (
-        'delta.autoOptimize.optimizeWrite' = 'true',
-        'delta.autoOptimize.autoCompact' = 'true'
-    )
+    TBLPROPERTIES ({pii_registry_properties})
     """
-    spark.sql(pii_registry_sql)
-    print("   ✓ PII registry table created")
     
-    # Grant permissions (adjust as needed)
-    print("\n5. Setting up permissions...")
+    def create_pii_registry():
+        if not _exists(spark, "TABLES", "pii_registry", parent=full_schema):
+            spark.sql(pii_registry_sql)
+            return
+        
+        # Bring registries created by earlier versions up to date
+        current = spark.sql(
+            f"SHOW TBLPROPERTIES {full_schema}.pii_registry ('delta.enableDeletionVectors')"
+        ).first()
+        if current is None or current["value"] != "true":
+            spark.sql(
+                f"ALTER TABLE {full_schema}.pii_registry "
+                f"SET TBLPROPERTIES ({pii_registry_properties})"
+            )
+    
+    def grant_permissions():
+        # Grant permissions (adjust as needed)
+        try:
+            spark.sql(f"GRANT SELECT ON SCHEMA {full_schema} TO `account users`")
+            return "   ✓ Permissions configured"
+        except Exception as e:
+            return f"   ⚠️  Permission setup skipped: {str(e)}"
+    
+    # The steps touch independent objects, so their metastore round-trips
+    # overlap; output is printed afterwards in step order
+    print("\n3. Creating governance tables and permissions...")
+    steps = [
+        (audit_logger._initialize_table, "   ✓ Audit logs table created"),
+        (lineage_tracker._initialize_table, "   ✓ Data lineage table created"),
+        (create_pii_registry, "   ✓ PII registry table created"),
+        (grant_permissions, None),
+    ]
     try:
-        spark.sql(f"GRANT SELECT ON SCHEMA {full_schema} TO `account users`")
-        print("   ✓ Permissions configured")
-    except Exception as e:
-        print(f"   ⚠️  Permission setup skipped: {str(e)}")
+        with ThreadPoolExecutor(max_workers=len(steps)) as executor:
+            futures = [executor.submit(step) for step, _ in steps]
+        
+        for future, (_, done_message) in zip(futures, steps):
+            # result() re-raises a failed table creation
+            print(future.result() or done_message)
+    finally:
+        # Write anything still queued and stop the background writer
+        audit_logger.flush()
+        audit_logger.close()
     
     print("\n" + "=" * 60)
     print("✓ GDPR Compliance tables initialized successfully!")